@@ -1,3 +1,12 @@
 from .routes.chat import ChatMessage, ChatRouter, router
+from .routes.consensus import ConsensusRequest, ConsensusRouter
+from .routes.health import HealthRouter
 
-__all__ = ["ChatMessage", "ChatRouter", "router"]
+__all__ = [
+    "ChatMessage",
+    "ChatRouter",
+    "ConsensusRequest",
+    "ConsensusRouter",
+    "HealthRouter",
+    "router",
+]
@@ -1,10 +1,18 @@
+import json
+from collections.abc import AsyncIterator
+
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
 
+from flare_ai_consensus.api.routes.disconnect import (
+    ClientDisconnectedError,
+    cancel_on_disconnect,
+    stream_until_disconnect,
+)
 from flare_ai_consensus.router import AsyncOpenRouterProvider, ChatRequest
-from flare_ai_consensus.settings import ConsensusConfig, Message
+from flare_ai_consensus.settings import ConsensusConfig
 from flare_ai_consensus.utils import parse_chat_response
 
 logger = structlog.get_logger(__name__)
@@ -20,10 +28,12 @@ class ChatMessage(BaseModel):
     Attributes:
         system_message (str): The system message/prompt to guide the model
         user_message (str): The user's message content, must not be empty
+        coalesce (bool): Share the upstream call with identical in-flight requests
     """
 
     system_message: str = Field(..., min_length=1)
     user_message: str = Field(..., min_length=1)
+    coalesce: bool = False
 
 
 class ResearchPaperRequest(BaseModel):
@@ -33,12 +43,14 @@ class ResearchPaperRequest(BaseModel):
     Attributes:
         topic (str): The debate topic
         perspectives (list): List of debate perspectives from different stances
-        system_message (Optional[str]): Custom system message for paper generation
+        system_message (str | None): Custom system message for paper generation
+        coalesce (bool): Share the upstream call with identical in-flight requests
     """
-    
+
     topic: str = Field(..., min_length=1)
     perspectives: list[dict[str, str]] = Field(..., min_items=1)
-    system_message: Optional[str] = None
+    system_message: str | None = None
+    coalesce: bool = False
 
 
 class ChatRouter:
@@ -50,7 +62,7 @@ class ChatRouter:
         self,
         router: APIRouter,
         provider: AsyncOpenRouterProvider,
-        consensus_config: Optional[ConsensusConfig] = None,
+        consensus_config: ConsensusConfig | None = None,
     ) -> None:
         """
         Initialize the ChatRouter.
@@ -62,7 +74,7 @@ class ChatRouter:
         """
         self._router = router
         self.provider = provider
-        self.consensus_config = consensus_config if consensus_config else None
+        self.consensus_config = consensus_config
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
@@ -72,98 +84,223 @@ class ChatRouter:
         """
 
         @self._router.post("/")
-        async def chat(message: ChatMessage) -> dict[str, str]:  # pyright: ignore [reportUnusedFunction]
+        async def chat(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, http_request: Request
+        ) -> dict[str, str]:
             """
             Handle chat messages and return a response.
 
+            The upstream call is cancelled if the client disconnects.
+
             Args:
                 message (ChatMessage): Validated chat message from the client
+                http_request (Request): The incoming request
 
             Returns:
                 dict[str, str]: Response message content
             """
-            self.logger.info(f"Received message: {message.user_message[:50]}...")
-            
+            self.logger.info("received message", message=message.user_message[:50])
+
             try:
                 # Create a ChatRequest payload
-                payload: ChatRequest = {
-                    "model": "openai/gpt-3.5-turbo",
-                    "messages": [
-                        {"role": "system", "content": message.system_message},
-                        {"role": "user", "content": message.user_message}
-                    ],
-                    "max_tokens": 2000,
-                    "temperature": 0.7,
-                }
-                
+                payload = self._chat_payload(message)
+
                 # Send the request
-                response = await self.provider.send_chat_completion(payload)
-                
+                response = await cancel_on_disconnect(
+                    http_request,
+                    self.provider.send_chat_completion(
+                        payload, coalesce=message.coalesce
+                    ),
+                )
+
                 # Parse the response
                 text = parse_chat_response(response)
-                
-                self.logger.info(f"Response: {text[:50]}...")
-                return {"response": text}
+            except ClientDisconnectedError:
+                raise
             except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
-                return {"response": f"Error processing message: {str(e)}"}
-        
-        @self._router.post("/research_paper")
-        async def generate_research_paper(request: ResearchPaperRequest) -> dict[str, str]:  # pyright: ignore [reportUnusedFunction]
+                self.logger.exception("error processing message")
+                return {"response": f"Error processing message: {e!s}"}
+            self.logger.info("response", response=text[:50])
+            return {"response": text}
+
+        @self._router.post("/stream")
+        async def chat_stream(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, http_request: Request
+        ) -> StreamingResponse:
             """
-            Generate a comprehensive research paper from debate perspectives.
+            Handle chat messages and stream the response as server-sent events.
+
+            The upstream stream is closed if the client disconnects.
 
             Args:
-                request (ResearchPaperRequest): Contains the debate topic and all perspectives
+                message (ChatMessage): Validated chat message from the client
+                http_request (Request): The incoming request
 
             Returns:
-                dict[str, str]: Generated research paper content with structured sections
+                StreamingResponse: `text/event-stream` of response deltas
             """
-            self.logger.info(f"Generating research paper for topic: {request.topic}")
-            
-            # Construct the system message if not provided
-            system_message = request.system_message or (
-                f"Generate a comprehensive research paper on the topic: \"{request.topic}\". "
-                f"The paper should synthesize multiple perspectives in an academic format, with "
-                f"an abstract, introduction, analysis of different viewpoints, discussion, "
-                f"conclusion, and references. Maintain an objective, scholarly tone throughout."
+            self.logger.info(
+                "received streaming message", message=message.user_message[:50]
             )
-            
-            # Construct the user message with all perspectives
-            perspectives_text = ""
-            for i, perspective in enumerate(request.perspectives):
-                stance = perspective.get("stance", f"Perspective {i+1}")
-                content = perspective.get("content", "")
-                perspectives_text += f"\n{stance}:\n{content}\n"
-            
-            user_message = (
-                f"Please generate a research paper for the topic \"{request.topic}\" "
-                f"based on these debate perspectives:\n{perspectives_text}"
+            payload = self._chat_payload(message)
+            return StreamingResponse(
+                stream_until_disconnect(http_request, self._event_stream(payload)),
+                media_type="text/event-stream",
             )
-            
+
+        @self._router.post("/research_paper")
+        async def generate_research_paper(  # pyright: ignore [reportUnusedFunction]
+            request: ResearchPaperRequest, http_request: Request
+        ) -> dict[str, str]:
+            """
+            Generate a comprehensive research paper from debate perspectives.
+
+            The upstream call is cancelled if the client disconnects.
+
+            Args:
+                request (ResearchPaperRequest): Contains the debate topic and all
+                    perspectives
+                http_request (Request): The incoming request
+
+            Returns:
+                dict[str, str]: Generated research paper content with structured
+                    sections
+            """
+            self.logger.info("generating research paper", topic=request.topic)
+
             try:
                 # Create a ChatRequest payload
-                payload: ChatRequest = {
-                    "model": "openai/gpt-3.5-turbo-16k",  # Using a model with more context for research papers
-                    "messages": [
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": user_message}
-                    ],
-                    "max_tokens": 4000,  # Longer for research papers
-                    "temperature": 0.5,   # More focused for academic content
-                }
-                
+                payload = self._research_paper_payload(request)
+
                 # Send the request
-                response = await self.provider.send_chat_completion(payload)
-                
+                response = await cancel_on_disconnect(
+                    http_request,
+                    self.provider.send_chat_completion(
+                        payload, coalesce=request.coalesce
+                    ),
+                )
+
                 # Parse the response
                 text = parse_chat_response(response)
-                
-                self.logger.info(f"Research paper generated successfully (length: {len(text)} chars)")
-                return {"response": text}
+            except ClientDisconnectedError:
+                raise
             except Exception as e:
-                self.logger.error(f"Error generating research paper: {e}")
-                return {"response": f"Error generating research paper: {str(e)}"}
+                self.logger.exception("error generating research paper")
+                return {"response": f"Error generating research paper: {e!s}"}
+            self.logger.info("research paper generated", length=len(text))
+            return {"response": text}
+
+        @self._router.post("/research_paper/stream")
+        async def generate_research_paper_stream(  # pyright: ignore [reportUnusedFunction]
+            request: ResearchPaperRequest, http_request: Request
+        ) -> StreamingResponse:
+            """
+            Generate a research paper and stream it as server-sent events.
+
+            The upstream stream is closed if the client disconnects.
+
+            Args:
+                request (ResearchPaperRequest): Contains the debate topic and all
+                    perspectives
+                http_request (Request): The incoming request
+
+            Returns:
+                StreamingResponse: `text/event-stream` of research paper deltas
+            """
+            self.logger.info("streaming research paper", topic=request.topic)
+            payload = self._research_paper_payload(request)
+            return StreamingResponse(
+                stream_until_disconnect(http_request, self._event_stream(payload)),
+                media_type="text/event-stream",
+            )
+
+    @staticmethod
+    def _chat_payload(message: ChatMessage) -> ChatRequest:
+        """
+        Build the ChatRequest payload for a chat message.
+
+        Args:
+            message (ChatMessage): Validated chat message from the client
+
+        Returns:
+            ChatRequest: Payload for the chat completions endpoint
+        """
+        return {
+            "model": "openai/gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": message.system_message},
+                {"role": "user", "content": message.user_message},
+            ],
+            "max_tokens": 2000,
+            "temperature": 0.7,
+        }
+
+    @staticmethod
+    def _research_paper_payload(request: ResearchPaperRequest) -> ChatRequest:
+        """
+        Build the ChatRequest payload for a research paper request.
+
+        Args:
+            request (ResearchPaperRequest): Contains the debate topic and all
+                perspectives
+
+        Returns:
+            ChatRequest: Payload for the chat completions endpoint
+        """
+        # Construct the system message if not provided
+        system_message = request.system_message or (
+            f'Generate a comprehensive research paper on the topic: "{request.topic}". '
+            "The paper should synthesize multiple perspectives in an academic format, "
+            "with an abstract, introduction, analysis of different viewpoints, "
+            "discussion, conclusion, and references. Maintain an objective, scholarly "
+            "tone throughout."
+        )
+
+        # Construct the user message with all perspectives
+        perspectives_text = ""
+        for i, perspective in enumerate(request.perspectives):
+            stance = perspective.get("stance", f"Perspective {i + 1}")
+            content = perspective.get("content", "")
+            perspectives_text += f"\n{stance}:\n{content}\n"
+
+        user_message = (
+            f'Please generate a research paper for the topic "{request.topic}" '
+            f"based on these debate perspectives:\n{perspectives_text}"
+        )
+
+        return {
+            # Using a model with more context for research papers
+            "model": "openai/gpt-3.5-turbo-16k",
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message},
+            ],
+            "max_tokens": 4000,  # Longer for research papers
+            "temperature": 0.5,  # More focused for academic content
+        }
+
+    async def _event_stream(self, payload: ChatRequest) -> AsyncIterator[str]:
+        """
+        Stream a chat completion as server-sent events.
+
+        Each delta is sent as a `data` event carrying `{"delta": ...}`; the
+        stream ends with a `done` event, or an `error` event if the upstream
+        call fails part-way.
+
+        Args:
+            payload (ChatRequest): Payload for the chat completions endpoint
+
+        Returns:
+            AsyncIterator[str]: Encoded server-sent events
+        """
+        try:
+            async for delta in self.provider.stream_chat_completion(payload):
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+        except Exception as e:
+            self.logger.exception("error streaming response")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
 
     @property
     def router(self) -> APIRouter:
@@ -0,0 +1,270 @@
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Any
+
+import structlog
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from flare_ai_consensus.api.routes.disconnect import (
+    cancel_on_disconnect,
+    stream_until_disconnect,
+)
+from flare_ai_consensus.consensus import (
+    ConsensusJob,
+    ConsensusJobQueue,
+    JobQueueFullError,
+    JobStatus,
+    run_consensus,
+    run_consensus_progressive,
+)
+from flare_ai_consensus.router import AsyncOpenRouterProvider
+from flare_ai_consensus.settings import ConsensusConfig, Message
+from flare_ai_consensus.utils import TraceWriter
+
+logger = structlog.get_logger(__name__)
+
+
+class ConsensusRequest(BaseModel):
+    """
+    Pydantic model for consensus requests.
+
+    Attributes:
+        system_message (str | None): Optional system instructions for the models
+        user_message (str): The user's prompt, must not be empty
+    """
+
+    system_message: str | None = None
+    user_message: str = Field(..., min_length=1)
+
+    def conversation(self) -> list[Message]:
+        """Build the initial conversation sent to every model."""
+        messages: list[Message] = []
+        if self.system_message:
+            messages.append({"role": "system", "content": self.system_message})
+        messages.append({"role": "user", "content": self.user_message})
+        return messages
+
+
+class ConsensusRouter:
+    """
+    A router running the consensus learning loop over the configured models.
+    """
+
+    def __init__(
+        self,
+        router: APIRouter,
+        provider: AsyncOpenRouterProvider,
+        consensus_config: ConsensusConfig | None = None,
+        trace_sink: TraceWriter | None = None,
+        job_queue: ConsensusJobQueue | None = None,
+    ) -> None:
+        """
+        Initialize the ConsensusRouter.
+
+        Args:
+            router (APIRouter): FastAPI router to attach endpoints.
+            provider: instance of an async OpenRouter client.
+            consensus_config: config for running the consensus algorithm.
+            trace_sink: optional writer storing the trace of every run.
+            job_queue: optional queue running consensus jobs in the background.
+        """
+        self._router = router
+        self.provider = provider
+        self.consensus_config = consensus_config
+        self.trace_sink = trace_sink
+        self.job_queue = job_queue
+        self.logger = logger.bind(router="consensus")
+        self._setup_routes()
+
+    def _config(self) -> ConsensusConfig:
+        if self.consensus_config is None:
+            raise HTTPException(status_code=503, detail="Consensus is not configured")
+        return self.consensus_config
+
+    def _jobs(self) -> ConsensusJobQueue:
+        if self.job_queue is None:
+            raise HTTPException(status_code=503, detail="Consensus jobs are disabled")
+        return self.job_queue
+
+    def _job(self, job_id: str) -> ConsensusJob:
+        job = self._jobs().get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return job
+
+    def _setup_routes(self) -> None:
+        """
+        Set up FastAPI routes for the consensus endpoints.
+        """
+
+        @self._router.post("/")
+        async def consensus(  # pyright: ignore [reportUnusedFunction]
+            request: ConsensusRequest, http_request: Request
+        ) -> dict[str, str]:
+            """
+            Run the consensus loop and return the final aggregate.
+
+            The run, including its in-flight model calls, is cancelled if the
+            client disconnects.
+
+            Args:
+                request (ConsensusRequest): Validated prompt from the client
+                http_request (Request): The incoming request
+
+            Returns:
+                dict[str, str]: The final aggregated response
+            """
+            config = self._config()
+            self.logger.info("running consensus", prompt=request.user_message[:50])
+            response = await cancel_on_disconnect(
+                http_request,
+                run_consensus(
+                    self.provider, config, request.conversation(), self.trace_sink
+                ),
+            )
+            return {"response": response}
+
+        @self._router.post("/stream")
+        async def consensus_stream(  # pyright: ignore [reportUnusedFunction]
+            request: ConsensusRequest, http_request: Request
+        ) -> StreamingResponse:
+            """
+            Run the consensus loop and stream each round's aggregate.
+
+            The run is cancelled if the client disconnects.
+
+            Args:
+                request (ConsensusRequest): Validated prompt from the client
+                http_request (Request): The incoming request
+
+            Returns:
+                StreamingResponse: `text/event-stream` of round updates
+            """
+            config = self._config()
+            self.logger.info("streaming consensus", prompt=request.user_message[:50])
+            return StreamingResponse(
+                stream_until_disconnect(
+                    http_request, self._event_stream(config, request.conversation())
+                ),
+                media_type="text/event-stream",
+            )
+
+        self._setup_job_routes()
+
+    def _setup_job_routes(self) -> None:
+        """
+        Set up FastAPI routes for background consensus jobs.
+        """
+
+        @self._router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+        async def submit_job(request: ConsensusRequest) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Queue a consensus run and return its job id without waiting for it.
+
+            Args:
+                request (ConsensusRequest): Validated prompt from the client
+
+            Returns:
+                dict[str, Any]: The job id and status
+            """
+            try:
+                job = self._jobs().submit(request.conversation())
+            except JobQueueFullError as e:
+                raise HTTPException(status_code=429, detail=str(e)) from e
+            return {"job_id": job.job_id, "status": str(job.status)}
+
+        @self._router.get("/jobs/{job_id}")
+        async def job_status(job_id: str) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Report the status of a consensus job.
+
+            The latest aggregate is included while the job is still running.
+
+            Args:
+                job_id (str): The id returned on submission
+
+            Returns:
+                dict[str, Any]: The job state
+            """
+            return self._job(job_id).snapshot()
+
+        @self._router.get("/jobs/{job_id}/result")
+        async def job_result(job_id: str) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Return the final aggregate of a finished consensus job.
+
+            Args:
+                job_id (str): The id returned on submission
+
+            Returns:
+                dict[str, Any]: The job status, response and error
+            """
+            job = self._job(job_id)
+            if not job.finished:
+                raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+            return {
+                "job_id": job.job_id,
+                "status": str(job.status),
+                "response": job.aggregate
+                if job.status is JobStatus.SUCCEEDED
+                else None,
+                "error": job.error,
+            }
+
+        @self._router.delete("/jobs/{job_id}")
+        async def cancel_job(job_id: str) -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Cancel a queued or running consensus job.
+
+            Args:
+                job_id (str): The id returned on submission
+
+            Returns:
+                dict[str, Any]: The job state
+            """
+            job = await self._jobs().cancel(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Unknown job")
+            return job.snapshot()
+
+    async def _event_stream(
+        self, config: ConsensusConfig, conversation: list[Message]
+    ) -> AsyncIterator[str]:
+        """
+        Stream consensus rounds as server-sent events.
+
+        Each completed round is sent as a `round` event carrying its
+        iteration, aggregate and per-model responses; later rounds replace
+        earlier aggregates. The stream ends with a `done` event, or an
+        `error` event if the loop fails.
+
+        Args:
+            config (ConsensusConfig): The consensus configuration
+            conversation (list[Message]): The initial conversation
+
+        Returns:
+            AsyncIterator[str]: Encoded server-sent events
+        """
+        try:
+            async for update in run_consensus_progressive(
+                self.provider, config, conversation, self.trace_sink
+            ):
+                yield f"event: round\ndata: {json.dumps(asdict(update))}\n\n"
+        except Exception as e:
+            self.logger.exception("consensus stream failed")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    @property
+    def router(self) -> APIRouter:
+        """
+        Get the FastAPI router with configured routes.
+
+        Returns:
+            APIRouter: Configured FastAPI router
+        """
+        return self._router
@@ -0,0 +1,111 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+
+import structlog
+from fastapi import HTTPException, Request
+
+logger = structlog.get_logger(__name__)
+
+# Non-standard status (nginx) for requests abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnectedError(HTTPException):
+    """Raised when a handler's work is cancelled because the client went away."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected"
+        )
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """
+    Return once the client has disconnected.
+
+    Only call this after the request body has been read (FastAPI reads it
+    before calling a handler with a body parameter), since it consumes the
+    remaining ASGI messages.
+
+    Args:
+        request (Request): The incoming request
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect[T](request: Request, call: Awaitable[T]) -> T:
+    """
+    Await `call`, cancelling it if the client disconnects first.
+
+    Cancellation propagates into the provider call or consensus round behind
+    `call`, which closes its upstream requests; the call is awaited until it
+    has finished unwinding.
+
+    Args:
+        request (Request): The incoming request
+        call (Awaitable[T]): The work done on behalf of the client
+
+    Returns:
+        T: The result of `call`
+
+    Raises:
+        ClientDisconnectedError: If the client disconnected before `call`
+            finished.
+    """
+    task = asyncio.ensure_future(call)
+    watcher = asyncio.ensure_future(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        logger.info("client disconnected, cancelling request", path=request.url.path)
+        raise ClientDisconnectedError
+    finally:
+        watcher.cancel()
+        task.cancel()
+        await asyncio.gather(task, watcher, return_exceptions=True)
+
+
+async def stream_until_disconnect(
+    request: Request, events: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    """
+    Relay `events` until they end or the client disconnects.
+
+    On disconnect the pending step of `events` is cancelled and the iterator
+    is closed, so upstream streams are released immediately instead of when
+    the next event would have been sent.
+
+    Args:
+        request (Request): The incoming request
+        events (AsyncIterator[str]): An async generator of encoded events
+
+    Returns:
+        AsyncIterator[str]: The events, up to the disconnect
+    """
+    watcher = asyncio.ensure_future(wait_for_disconnect(request))
+    try:
+        while True:
+            step = asyncio.ensure_future(anext(events))
+            await asyncio.wait({step, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not step.done():
+                logger.info(
+                    "client disconnected, cancelling stream", path=request.url.path
+                )
+                step.cancel()
+                await asyncio.gather(step, return_exceptions=True)
+                return
+            try:
+                event = step.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,57 @@
+from dataclasses import asdict
+from typing import Any
+
+import structlog
+from fastapi import APIRouter
+
+from flare_ai_consensus.router import AsyncOpenRouterProvider
+
+logger = structlog.get_logger(__name__)
+
+
+class HealthRouter:
+    """
+    A router exposing the provider's per-model health and latency state.
+    """
+
+    def __init__(self, router: APIRouter, provider: AsyncOpenRouterProvider) -> None:
+        """
+        Initialize the HealthRouter.
+
+        Args:
+            router (APIRouter): FastAPI router to attach endpoints.
+            provider: instance of an async OpenRouter client.
+        """
+        self._router = router
+        self.provider = provider
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        """
+        Set up FastAPI routes for the health endpoint.
+        """
+
+        @self._router.get("/")
+        async def health() -> dict[str, Any]:  # pyright: ignore [reportUnusedFunction]
+            """
+            Report circuit breaker state, latency percentiles and cache stats.
+
+            Returns:
+                dict[str, Any]: Health state keyed by section and model id
+            """
+            cache = self.provider.cache
+            return {
+                "models": self.provider.health.snapshot(),
+                "latency": self.provider.latency.snapshot(),
+                "cache": asdict(cache.stats) if cache is not None else None,
+            }
+
+    @property
+    def router(self) -> APIRouter:
+        """
+        Get the FastAPI router with configured routes.
+
+        Returns:
+            APIRouter: Configured FastAPI router
+        """
+        return self._router
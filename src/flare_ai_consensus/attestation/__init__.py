@@ -1,18 +1,38 @@
+from .batch_attestation import (
+    BatchAttestationVerifier,
+    BatchAttestor,
+    MerkleProof,
+    ResponseAttestation,
+)
+from .token_pool import AttestationTokenPool, NonceSchedule, PooledToken
 from .vtpm_attestation import (
+    AsyncVtpm,
     Vtpm,
     VtpmAttestationError,
 )
 from .vtpm_validation import (
+    AsyncVtpmValidation,
     CertificateParsingError,
     InvalidCertificateChainError,
+    JwksCache,
     SignatureValidationError,
     VtpmValidation,
     VtpmValidationError,
 )
 
 __all__ = [
+    "AsyncVtpm",
+    "AsyncVtpmValidation",
+    "AttestationTokenPool",
+    "BatchAttestationVerifier",
+    "BatchAttestor",
     "CertificateParsingError",
     "InvalidCertificateChainError",
+    "JwksCache",
+    "MerkleProof",
+    "NonceSchedule",
+    "PooledToken",
+    "ResponseAttestation",
     "SignatureValidationError",
     "Vtpm",
     "VtpmAttestationError",
@@ -0,0 +1,345 @@
+"""
+Batched attestation of responses through Merkle roots.
+
+Instead of one attestation token per response, responses arriving within a short
+window are hashed into a Merkle tree and a single token is requested with the root
+as its nonce. Each response gets the shared token plus an inclusion proof, so the
+attestation cost is one token per batch rather than one per response.
+
+Leaves and inner nodes are hashed with distinct prefixes (as in RFC 6962) so that
+an inner node can never be passed off as a leaf. A node without a sibling is carried
+up to the next level unchanged.
+
+Classes:
+    MerkleProof: Inclusion proof of a leaf in a Merkle tree
+    ResponseAttestation: Token and inclusion proof attesting one response
+    BatchAttestor: Collects responses and attests each batch with one token
+    BatchAttestationVerifier: Checks a response against its attestation
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from .vtpm_attestation import AsyncVtpm
+from .vtpm_validation import VtpmValidation, VtpmValidationError
+
+logger = structlog.get_logger(__name__)
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+HASH_BYTES = hashlib.sha256().digest_size
+
+
+def leaf_hash(data: bytes) -> bytes:
+    """Hash a response into a Merkle leaf."""
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash two child nodes into their parent."""
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def merkle_levels(leaves: Sequence[bytes]) -> list[list[bytes]]:
+    """
+    Build a Merkle tree bottom-up.
+
+    Args:
+        leaves: Leaf hashes, at least one
+
+    Returns:
+        list[list[bytes]]: The levels of the tree, from the leaves to the root
+
+    Raises:
+        ValueError: If there are no leaves
+    """
+    if not leaves:
+        msg = "A Merkle tree needs at least one leaf"
+        raise ValueError(msg)
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [
+            node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+@dataclass(frozen=True)
+class MerkleProof:
+    """
+    Inclusion proof of a leaf in a Merkle tree.
+
+    Attributes:
+        index: Position of the leaf
+        siblings: Hex-encoded sibling hashes from the leaf up, each with whether
+            the sibling is the left child
+    """
+
+    index: int
+    siblings: list[tuple[str, bool]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, levels: list[list[bytes]], index: int) -> "MerkleProof":
+        """
+        Build the proof for a leaf of a tree built by `merkle_levels`.
+
+        Args:
+            levels: Levels of the tree
+            index: Position of the leaf
+
+        Returns:
+            MerkleProof: The inclusion proof
+        """
+        siblings: list[tuple[str, bool]] = []
+        position = index
+        for level in levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                siblings.append((level[sibling].hex(), sibling < position))
+            position //= 2
+        return cls(index, siblings)
+
+    def root(self, leaf: bytes) -> bytes:
+        """
+        Recompute the root of the tree from a leaf hash.
+
+        Args:
+            leaf: Hash of the leaf the proof is for
+
+        Returns:
+            bytes: The root implied by the proof
+
+        Raises:
+            ValueError: If a sibling is not a hex-encoded SHA-256 hash
+        """
+        node = leaf
+        for sibling_hex, sibling_is_left in self.siblings:
+            sibling = bytes.fromhex(sibling_hex)
+            if len(sibling) != HASH_BYTES:
+                msg = f"Sibling hash must be {HASH_BYTES} bytes, got {len(sibling)}"
+                raise ValueError(msg)
+            node = (
+                node_hash(sibling, node)
+                if sibling_is_left
+                else node_hash(node, sibling)
+            )
+        return node
+
+
+@dataclass(frozen=True)
+class ResponseAttestation:
+    """
+    Attestation of a single response.
+
+    Attributes:
+        token: Attestation token whose nonce is the batch root
+        root: Hex-encoded Merkle root of the batch
+        proof: Inclusion proof of the response in the batch
+    """
+
+    token: str
+    root: str
+    proof: MerkleProof
+
+
+class BatchAttestor:
+    """
+    Attests responses in batches, one attestation token per batch.
+
+    `attest` queues a response and waits for its batch. A batch is closed `window`
+    seconds after its first response, or as soon as it holds `max_batch` responses;
+    its Merkle root (64 hex characters, within the attestation service's nonce limit)
+    is then sent as the nonce of a single token request.
+
+    Args:
+        vtpm: Client for the attestation service
+        window: Seconds a batch stays open after its first response (default: 0.05)
+        max_batch: Maximum responses per batch (default: 256)
+        audience: Audience of the tokens (default: "https://sts.google.com")
+        token_type: Type of the tokens, "OIDC" or "PKI" (default: "OIDC")
+
+    Usage:
+        attestor = BatchAttestor(AsyncVtpm())
+        attestation = await attestor.attest(response_text)
+    """
+
+    def __init__(
+        self,
+        vtpm: AsyncVtpm,
+        *,
+        window: float = 0.05,
+        max_batch: int = 256,
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+    ) -> None:
+        self.vtpm = vtpm
+        self.window = window
+        self.max_batch = max_batch
+        self.audience = audience
+        self.token_type = token_type
+        self._pending: list[tuple[bytes, asyncio.Future[ResponseAttestation]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        self.logger = logger.bind(router="batch_attestor")
+
+    async def attest(self, response: str | bytes) -> ResponseAttestation:
+        """
+        Attest a response.
+
+        Args:
+            response: The response text or bytes, as it will be verified
+
+        Returns:
+            ResponseAttestation: The batch token and the response's inclusion proof
+
+        Raises:
+            VtpmAttestationError: If the token for the batch could not be obtained
+        """
+        data = response.encode() if isinstance(response, str) else response
+        future: asyncio.Future[ResponseAttestation] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending.append((leaf_hash(data), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+        return await future
+
+    async def close(self) -> None:
+        """Attest the open batch and wait for all batches in flight."""
+        self._flush()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _flush(self) -> None:
+        """Close the open batch and request its token in the background."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._attest_batch(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _attest_batch(
+        self, batch: list[tuple[bytes, asyncio.Future[ResponseAttestation]]]
+    ) -> None:
+        levels = merkle_levels([leaf for leaf, _ in batch])
+        root = levels[-1][0].hex()
+        try:
+            token = await self.vtpm.get_token(
+                [root], audience=self.audience, token_type=self.token_type
+            )
+        except Exception as e:
+            self.logger.exception("batch_attestation_failed", size=len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.logger.info("batch_attested", size=len(batch), root=root)
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(
+                    ResponseAttestation(token, root, MerkleProof.build(levels, index))
+                )
+
+
+def _token_nonces(claims: dict[str, Any]) -> list[str]:
+    """Return the nonces bound into a Confidential Space token."""
+    nonces = claims.get("eat_nonce", [])
+    return [nonces] if isinstance(nonces, str) else list(nonces)
+
+
+class BatchAttestationVerifier:
+    """
+    Verifies responses attested by a BatchAttestor.
+
+    A response is accepted if its attestation token validates, the token's nonce is
+    the attested Merkle root, and the inclusion proof leads from the response to that
+    root. Responses of the same batch share a token, whose validation is served from
+    the validator's claims cache after the first check.
+
+    Args:
+        validator: Validator for the attestation tokens (default: VtpmValidation())
+    """
+
+    def __init__(self, validator: VtpmValidation | None = None) -> None:
+        self.validator = validator or VtpmValidation()
+
+    def verify(
+        self, response: str | bytes, attestation: ResponseAttestation
+    ) -> dict[str, Any]:
+        """
+        Verify a response against its attestation.
+
+        Args:
+            response: The response text or bytes, as it was attested
+            attestation: The response's attestation
+
+        Returns:
+            dict: The validated claims of the attestation token
+
+        Raises:
+            VtpmValidationError: If the token is invalid, was not issued for the
+                attested root, or the response is not part of the batch
+        """
+        claims = self.validator.validate_token(attestation.token)
+        self._check(response, attestation, claims)
+        return claims
+
+    def verify_many(
+        self, attested: Sequence[tuple[str | bytes, ResponseAttestation]]
+    ) -> list[dict[str, Any] | VtpmValidationError]:
+        """
+        Verify a batch of responses, validating each distinct token once.
+
+        Args:
+            attested: Pairs of response and attestation
+
+        Returns:
+            list: For each response, in order, the token claims or the
+                VtpmValidationError explaining why it was rejected
+        """
+        tokens = list(dict.fromkeys(attestation.token for _, attestation in attested))
+        validated = dict(
+            zip(tokens, self.validator.validate_tokens(tokens), strict=True)
+        )
+        results: list[dict[str, Any] | VtpmValidationError] = []
+        for response, attestation in attested:
+            claims = validated[attestation.token]
+            if not isinstance(claims, VtpmValidationError):
+                try:
+                    self._check(response, attestation, claims)
+                except VtpmValidationError as e:
+                    claims = e
+            results.append(claims)
+        return results
+
+    @staticmethod
+    def _check(
+        response: str | bytes, attestation: ResponseAttestation, claims: dict[str, Any]
+    ) -> None:
+        if attestation.root not in _token_nonces(claims):
+            msg = "Attestation token was not issued for the attested Merkle root"
+            raise VtpmValidationError(msg)
+        data = response.encode() if isinstance(response, str) else response
+        try:
+            root = attestation.proof.root(leaf_hash(data))
+        except (TypeError, ValueError) as e:
+            msg = "Malformed inclusion proof"
+            raise VtpmValidationError(msg) from e
+        if root.hex() != attestation.root:
+            msg = "Response is not included in the attested batch"
+            raise VtpmValidationError(msg)
@@ -0,0 +1,248 @@
+"""
+Pool of pre-minted attestation tokens.
+
+Requesting a vTPM token costs a round-trip to the launcher over its Unix socket
+plus signing, which is too slow to do on the response path of every attested answer.
+This module mints tokens ahead of time for nonces derived from a server-side key
+schedule, so a request takes a ready token in O(1) while the pool refills in the
+background.
+
+Classes:
+    NonceSchedule: Deterministic nonces derived from a rolling HMAC key schedule
+    PooledToken: An attestation token and the nonce it was minted for
+    AttestationTokenPool: Keeps a number of tokens ready and replenishes them
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Self
+
+import structlog
+
+from .vtpm_attestation import (
+    MAX_NONCE_BYTES,
+    MIN_NONCE_BYTES,
+    AsyncVtpm,
+    VtpmAttestationError,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class NonceSchedule:
+    """
+    Derives the nonce sequence bound into pooled tokens.
+
+    Nonce `i` is the hex HMAC-SHA256 of `i` under the key of its epoch, truncated to
+    `nonce_length` characters. Every `epoch_length` nonces the key is replaced by its
+    SHA-256 hash, so an epoch key on its own only exposes its own and later epochs.
+    The initial secret is kept so that `derive` can recompute any nonce, to check
+    which index (and so which point in time) a token was minted for; whoever holds
+    the secret, or the memory of this object, can derive every nonce.
+
+    Args:
+        secret: Initial key (default: 32 random bytes)
+        nonce_length: Characters per nonce, within the attestation service's
+            10-74 byte limit (default: 64)
+        epoch_length: Nonces derived under each key (default: 1024)
+        start: Index of the first nonce returned by `next` (default: 0)
+
+    Raises:
+        VtpmAttestationError: If `nonce_length` is outside the allowed range
+    """
+
+    def __init__(
+        self,
+        secret: bytes | None = None,
+        nonce_length: int = 64,
+        epoch_length: int = 1024,
+        start: int = 0,
+    ) -> None:
+        if not MIN_NONCE_BYTES <= nonce_length <= min(MAX_NONCE_BYTES, 64):
+            msg = (
+                f"Nonce length must be between {MIN_NONCE_BYTES} and "
+                f"{min(MAX_NONCE_BYTES, 64)} characters, got {nonce_length}"
+            )
+            raise VtpmAttestationError(msg)
+        self.nonce_length = nonce_length
+        self.epoch_length = epoch_length
+        self._root_key = secret or os.urandom(32)
+        self._counter = itertools.count(start)
+        # Key of the current epoch, advanced by hashing
+        self._epoch = 0
+        self._epoch_key = self._root_key
+
+    def next(self) -> tuple[int, str]:
+        """
+        Return the next index and its nonce.
+
+        Returns:
+            tuple[int, str]: The nonce index and the nonce
+        """
+        index = next(self._counter)
+        return index, self._nonce(index, self._key_for(index))
+
+    def derive(self, index: int) -> str:
+        """
+        Recompute the nonce with the given index.
+
+        Args:
+            index: Position in the schedule
+
+        Returns:
+            str: The nonce
+        """
+        key = self._root_key
+        for _ in range(index // self.epoch_length):
+            key = hashlib.sha256(key).digest()
+        return self._nonce(index, key)
+
+    def _key_for(self, index: int) -> bytes:
+        # Indices only grow, so the epoch key is advanced, never recomputed
+        while self._epoch < index // self.epoch_length:
+            self._epoch_key = hashlib.sha256(self._epoch_key).digest()
+            self._epoch += 1
+        return self._epoch_key
+
+    def _nonce(self, index: int, key: bytes) -> str:
+        digest = hmac.new(key, index.to_bytes(8, "big"), hashlib.sha256).hexdigest()
+        return digest[: self.nonce_length]
+
+
+@dataclass(frozen=True)
+class PooledToken:
+    """
+    An attestation token minted ahead of time.
+
+    Attributes:
+        token: The attestation token in JWT format
+        nonce: The nonce bound into the token
+        index: Position of the nonce in the NonceSchedule
+        minted_at: UNIX time the token was received
+    """
+
+    token: str
+    nonce: str
+    index: int
+    minted_at: float
+
+
+class AttestationTokenPool:
+    """
+    Keeps `size` attestation tokens ready for the response path.
+
+    A background task mints tokens for the nonces of a NonceSchedule until `size`
+    are ready, and refills the pool whenever tokens are taken. `take` pops a ready
+    token in O(1); only when the pool has run dry does it mint one itself. Tokens
+    older than `max_age` are discarded instead of handed out, since attestation
+    tokens expire.
+
+    Args:
+        vtpm: Client for the attestation service
+        size: Number of tokens kept ready (default: 8)
+        audience: Audience of the minted tokens (default: "https://sts.google.com")
+        token_type: Type of the minted tokens, "OIDC" or "PKI" (default: "OIDC")
+        max_age: Seconds a minted token may be handed out for (default: 3000,
+            below the one hour lifetime of Confidential Space tokens)
+        schedule: Source of the nonces (default: a NonceSchedule with a random key)
+
+    Usage:
+        async with AttestationTokenPool(AsyncVtpm()) as pool:
+            pooled = await pool.take()
+            # Attach pooled.token and pooled.nonce to the response
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        vtpm: AsyncVtpm,
+        *,
+        size: int = 8,
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+        max_age: float = 3000,
+        schedule: NonceSchedule | None = None,
+    ) -> None:
+        self.vtpm = vtpm
+        self.size = size
+        self.audience = audience
+        self.token_type = token_type
+        self.max_age = max_age
+        self.schedule = schedule or NonceSchedule()
+        self._ready: deque[PooledToken] = deque()
+        self._wanted = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.logger = logger.bind(router="token_pool")
+
+    async def __aenter__(self) -> Self:
+        self.start()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    def start(self) -> None:
+        """Start filling the pool in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._replenish(), name="token-pool")
+            self._wanted.set()
+
+    async def close(self) -> None:
+        """Stop replenishing and drop the ready tokens."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._ready.clear()
+
+    async def take(self) -> PooledToken:
+        """
+        Hand out a token bound to a fresh nonce.
+
+        Returns:
+            PooledToken: A token that has not been handed out before
+
+        Raises:
+            VtpmAttestationError: If the pool is empty and minting a token fails
+        """
+        self.start()
+        expired_before = time.time() - self.max_age
+        while self._ready:
+            pooled = self._ready.popleft()
+            if pooled.minted_at >= expired_before:
+                self._wanted.set()
+                return pooled
+        self.logger.info("token_pool_empty", size=self.size)
+        self._wanted.set()
+        return await self._mint()
+
+    async def _mint(self) -> PooledToken:
+        index, nonce = self.schedule.next()
+        token = await self.vtpm.get_token(
+            [nonce], audience=self.audience, token_type=self.token_type
+        )
+        return PooledToken(token, nonce, index, time.time())
+
+    async def _replenish(self) -> None:
+        failures = 0
+        while True:
+            await self._wanted.wait()
+            self._wanted.clear()
+            while len(self._ready) < self.size:
+                try:
+                    self._ready.append(await self._mint())
+                    failures = 0
+                except Exception:
+                    # Keep refilling whatever failed, or the pool would drain
+                    failures += 1
+                    self.logger.exception("token_mint_failed", failures=failures)
+                    # Back off while the attestation service is unavailable
+                    await asyncio.sleep(min(2**failures, 60))
@@ -3,18 +3,22 @@ Client for communicating with the Confidential Space vTPM attestation service.
 
 This module provides a client to request attestation tokens from a local Unix domain
 socket endpoint. It extends HTTPConnection to handle Unix socket communication and
-implements token request functionality with nonce validation.
+implements token request functionality with nonce validation. An async client keeps a
+persistent httpx connection to the socket for use on an event loop.
 
 Classes:
     VtpmAttestationError: Exception for attestation service communication errors
     VtpmAttestation: Client for requesting attestation tokens
+    AsyncVtpm: Non-blocking client for requesting attestation tokens
 """
 
 import json
 import socket
 from http.client import HTTPConnection
 from pathlib import Path
+from typing import Any, Self
 
+import httpx
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -29,6 +33,11 @@ def get_simulated_token() -> str:
 SIM_TOKEN = get_simulated_token()
 
 
+MIN_NONCE_BYTES = 10
+MAX_NONCE_BYTES = 74
+SUCCESS_STATUS = 200
+
+
 class VtpmAttestationError(Exception):
     """
     Exception raised for attestation service communication errors.
@@ -38,6 +47,32 @@ class VtpmAttestationError(Exception):
     """
 
 
+def _check_nonce_length(nonces: list[str]) -> None:
+    """
+    Validate the byte length of provided nonces.
+
+    Args:
+        nonces: List of nonce strings to validate
+
+    Raises:
+        VtpmAttestationError: If any nonce is outside the valid length range
+    """
+    for nonce in nonces:
+        byte_len = len(nonce.encode("utf-8"))
+        logger.debug("nonce_length", byte_len=byte_len)
+        if byte_len < MIN_NONCE_BYTES or byte_len > MAX_NONCE_BYTES:
+            msg = (
+                f"Nonce '{nonce}' must be between {MIN_NONCE_BYTES} bytes"
+                f" and {MAX_NONCE_BYTES} bytes"
+            )
+            raise VtpmAttestationError(msg)
+
+
+def _token_request(nonces: list[str], audience: str, token_type: str) -> dict[str, Any]:
+    """Build the JSON body of a token request."""
+    return {"audience": audience, "token_type": token_type, "nonces": nonces}
+
+
 class Vtpm:
     """
     Client for requesting attestation tokens via Unix domain socket."""
@@ -69,15 +104,7 @@ class Vtpm:
         Raises:
             VtpmAttestationError: If any nonce is outside the valid length range
         """
-        min_byte_len = 10
-        max_byte_len = 74
-        for nonce in nonces:
-            byte_len = len(nonce.encode("utf-8"))
-            self.logger.debug("nonce_length", byte_len=byte_len)
-            if byte_len < min_byte_len or byte_len > max_byte_len:
-                msg = f"Nonce '{nonce}' must be between {min_byte_len} bytes"
-                f" and {max_byte_len} bytes"
-                raise VtpmAttestationError(msg)
+        _check_nonce_length(nonces)
 
     def get_token(
         self,
@@ -127,15 +154,12 @@ class Vtpm:
 
         # Send a POST request
         headers = {"Content-Type": "application/json"}
-        body = json.dumps(
-            {"audience": audience, "token_type": token_type, "nonces": nonces}
-        )
+        body = json.dumps(_token_request(nonces, audience, token_type))
         conn.request("POST", self.url, body=body, headers=headers)
 
         # Get and decode the response
         res = conn.getresponse()
-        success_status = 200
-        if res.status != success_status:
+        if res.status != SUCCESS_STATUS:
             msg = f"Failed to get attestation response: {res.status} {res.reason}"
             raise VtpmAttestationError(msg)
         token = res.read().decode()
@@ -144,3 +168,97 @@ class Vtpm:
         # Close the connection
         conn.close()
         return token
+
+
+class AsyncVtpm:
+    """
+    Non-blocking client for requesting attestation tokens via Unix domain socket.
+
+    Requests go through an httpx client bound to the socket, which keeps its
+    connection open between requests, so callers on the event loop neither
+    block nor pay for a new connection per token.
+
+    Usage:
+        async with AsyncVtpm() as vtpm:
+            token = await vtpm.get_token(nonces=["random_nonce"])
+    """
+
+    def __init__(
+        self,
+        url: str = "http://localhost/v1/token",
+        unix_socket_path: str = "/run/container_launcher/teeserver.sock",
+        simulate: bool = False,  # noqa: FBT001, FBT002
+        timeout: float = 10,
+    ) -> None:
+        self.url = url
+        self.unix_socket_path = unix_socket_path
+        self.simulate = simulate
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self.logger = logger.bind(router="async_vtpm")
+        self.logger.debug(
+            "vtpm", simulate=simulate, url=url, unix_socket_path=self.unix_socket_path
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=self.unix_socket_path),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection to the attestation service."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_token(
+        self,
+        nonces: list[str],
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+    ) -> str:
+        """
+        Request an attestation token from the service.
+
+        Args:
+            nonces: List of random nonce strings for replay protection
+            audience: Intended audience for the token (default: "https://sts.google.com")
+            token_type: Type of token, either "OIDC" or "PKI" (default: "OIDC")
+
+        Returns:
+            str: The attestation token in JWT format
+
+        Raises:
+            VtpmAttestationError: If token request fails for any reason
+                (invalid nonces, service unavailable, etc.)
+        """
+        _check_nonce_length(nonces)
+        if self.simulate:
+            self.logger.debug("sim_token", token=SIM_TOKEN)
+            return SIM_TOKEN
+
+        try:
+            res = await self._get_client().post(
+                self.url, json=_token_request(nonces, audience, token_type)
+            )
+        except httpx.HTTPError as e:
+            msg = f"Failed to reach attestation service: {e}"
+            raise VtpmAttestationError(msg) from e
+        if res.status_code != SUCCESS_STATUS:
+            msg = (
+                "Failed to get attestation response: "
+                f"{res.status_code} {res.reason_phrase}"
+            )
+            raise VtpmAttestationError(msg)
+        token = res.text
+        self.logger.debug("token", token_type=token_type, token=token)
+        return token
@@ -10,29 +10,42 @@ Classes:
     CertificateParsingError: Raised when certificate parsing fails
     SignatureValidationError: Raised when signature verification fails
     PKICertificates: Container for certificate chain components
+    VerifiedChain: Leaf key of an x5c chain that passed validation
+    JwksCache: Cache of the issuer's OIDC signing keys
     VtpmValidation: Main validator class for vTPM token verification
+    AsyncVtpmValidation: Non-blocking validator for use on an event loop
 
 Constants:
     ALGO: JWT signing algorithm (RS256)
     CERT_HASH_ALGO: Certificate hashing algorithm (sha256)
     CERT_COUNT: Expected number of certificates in chain
     CERT_FINGERPRINT: Expected root certificate fingerprint
+    DEFAULT_KEY_TTL: Lifetime of cached keys without a Cache-Control max-age
+    MAX_VERIFIED_CHAINS: Default number of verified x5c chains kept
+    MAX_CACHED_TOKENS: Default number of validated tokens whose claims are kept
+    FETCH_ERRORS: Errors raised when the issuer's documents cannot be fetched
 """
 
+import asyncio
 import base64
 import datetime
 import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Any, Final
+from typing import Any, Final, Self, cast
 
+import httpx
 import jwt
 import requests
 import structlog
 from cryptography import x509
 from cryptography.exceptions import InvalidKey
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import rsa
 from OpenSSL.crypto import X509, X509Store, X509StoreContext
 from OpenSSL.crypto import Error as OpenSSLError
@@ -72,6 +85,20 @@ class PKICertificates:
     root_cert: x509.Certificate
 
 
+@dataclass(frozen=True)
+class VerifiedChain:
+    """
+    An x5c certificate chain that passed validation against the pinned root.
+
+    Attributes:
+        public_key: Public key of the leaf certificate, used to verify tokens
+        not_valid_after: Earliest expiry of the certificates in the chain
+    """
+
+    public_key: rsa.RSAPublicKey
+    not_valid_after: datetime.datetime
+
+
 type JSONWebKeySet = dict[str, list[dict[str, str]]]
 
 # Constants
@@ -81,6 +108,270 @@ CERT_COUNT: Final[int] = 3
 CERT_FINGERPRINT: Final[str] = (
     "B9:51:20:74:2C:24:E3:AA:34:04:2E:1C:3B:A3:AA:D2:8B:21:23:21"
 )
+DEFAULT_KEY_TTL: Final[float] = 3600.0
+MAX_VERIFIED_CHAINS: Final[int] = 256
+MAX_CACHED_TOKENS: Final[int] = 4096
+VALID_STATUS_CODE: Final[int] = 200
+# Unreachable issuer, error status or malformed document
+FETCH_ERRORS: Final = (
+    httpx.HTTPError,
+    requests.exceptions.RequestException,
+    KeyError,
+    ValueError,
+)
+
+_MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _cache_lifetime(
+    response: requests.Response | httpx.Response, default: float
+) -> float:
+    """
+    Return how long a response may be cached, from its Cache-Control header.
+
+    Args:
+        response: The HTTP response
+        default: Lifetime used when the header carries no max-age
+
+    Returns:
+        float: Lifetime in seconds; 0 for no-store / no-cache responses
+    """
+    cache_control = response.headers.get("Cache-Control", "")
+    if re.search(r"no-store|no-cache", cache_control, re.IGNORECASE):
+        return 0.0
+    match = _MAX_AGE_PATTERN.search(cache_control)
+    return float(match.group(1)) if match else default
+
+
+def _jwk_to_rsa_key(jwk: dict[str, str]) -> rsa.RSAPublicKey:
+    """
+    Convert a JSON Web Key (JWK) to an RSA public key.
+
+    Extracts and decodes the modulus (n) and exponent (e) values of the JWK.
+
+    Args:
+        jwk: Dictionary containing the JWK parameters, must include 'n' (modulus)
+            and 'e' (exponent) fields in base64url encoding
+
+    Returns:
+        RSAPublicKey: A cryptographic RSA public key object
+    """
+    n = int.from_bytes(base64.urlsafe_b64decode(jwk["n"] + "=="), "big")
+    e = int.from_bytes(base64.urlsafe_b64decode(jwk["e"] + "=="), "big")
+    return rsa.RSAPublicNumbers(e, n).public_key(backend=default_backend())
+
+
+class JwksCache:
+    """
+    Thread-safe cache of an OIDC issuer's RSA signing keys, keyed by key ID.
+
+    Keys are parsed once per JWKS fetch and kept for the max-age announced in
+    the JWKS response's Cache-Control header (`default_ttl` if absent). Once a
+    `refresh_ahead` fraction of that lifetime has passed, lookups keep serving
+    the cached keys while a background thread refetches them, so validation
+    normally never waits on the network. A lookup only blocks when the keys
+    have fully expired, or on an unknown kid (e.g. after a key rotation),
+    which triggers at most one refetch per `min_refetch_interval` seconds.
+
+    Async callers refresh the keys with `arefresh` before looking them up, and
+    disable the background thread with `background_refresh=False` and lookups
+    that fetch with `fetch_on_demand=False`.
+
+    Args:
+        expected_issuer: Base URL of the token issuer
+        oidc_endpoint: Path to the OpenID Connect configuration
+        default_ttl: Key lifetime used without a Cache-Control max-age
+        refresh_ahead: Fraction of the lifetime after which keys are refreshed
+            in the background
+        min_refetch_interval: Minimum seconds between refetches on unknown kids
+        background_refresh: Whether lookups on stale keys start a background
+            refresh thread
+        fetch_on_demand: Whether lookups on expired keys or unknown kids fetch
+            the keys; without it they fail instead
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        expected_issuer: str,
+        oidc_endpoint: str,
+        default_ttl: float = DEFAULT_KEY_TTL,
+        refresh_ahead: float = 0.8,
+        min_refetch_interval: float = 30.0,
+        *,
+        background_refresh: bool = True,
+        fetch_on_demand: bool = True,
+    ) -> None:
+        self.expected_issuer = expected_issuer
+        self.oidc_endpoint = oidc_endpoint
+        self.default_ttl = default_ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.background_refresh = background_refresh
+        self.fetch_on_demand = fetch_on_demand
+        self._keys: dict[str, rsa.RSAPublicKey] = {}
+        self._jwks_uri: str | None = None
+        self._jwks_uri_expires_at = 0.0
+        self._fetched_at = 0.0
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self.logger = logger.bind(router="jwks_cache")
+
+    def get_key(self, kid: str) -> rsa.RSAPublicKey:
+        """
+        Return the signing key with the given key ID.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            RSAPublicKey: The issuer's public key
+
+        Raises:
+            VtpmValidationError: If the issuer publishes no key with this ID, or
+                the keys have expired and `fetch_on_demand` is off
+            requests.exceptions.HTTPError: If the keys had to be fetched and
+                the issuer could not be reached
+        """
+        if self.needs_fetch(kid):
+            if not self.fetch_on_demand:
+                if self.is_expired():
+                    msg = "Signing keys have expired and were not refetched"
+                    raise VtpmValidationError(msg)
+            else:
+                if self._keys and kid not in self._keys:
+                    self.logger.info("kid_miss", kid=kid)
+                self.refresh()
+        elif self.background_refresh and self.is_stale():
+            self._refresh_in_background()
+
+        with self._lock:
+            key = self._keys.get(kid)
+        if key is None:
+            msg = "Unable to find appropriate key id (kid) in header"
+            raise VtpmValidationError(msg)
+        return key
+
+    def needs_fetch(self, kid: str) -> bool:
+        """
+        Return whether a lookup of `kid` has to wait for a fetch.
+
+        That is the case once the keys have expired, or when `kid` is unknown
+        and no refetch happened in the last `min_refetch_interval` seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._expires_at:
+                return True
+            return (
+                kid not in self._keys
+                and now - self._fetched_at >= self.min_refetch_interval
+            )
+
+    def is_stale(self) -> bool:
+        """Return whether the keys are due for a background refresh."""
+        with self._lock:
+            return time.monotonic() >= self._refresh_at
+
+    def is_expired(self) -> bool:
+        """Return whether the keys have expired (or were never fetched)."""
+        with self._lock:
+            return time.monotonic() >= self._expires_at
+
+    def refresh(self) -> None:
+        """
+        Refetch the JWKS and replace the cached keys.
+
+        Concurrent callers share a single fetch.
+
+        Raises:
+            requests.exceptions.HTTPError: If the issuer could not be reached
+        """
+        fetched_at = self._fetched_at
+        with self._refresh_lock:
+            if self._fetched_at != fetched_at:
+                # Another thread refreshed the keys while we waited
+                return
+            if self._jwks_uri_expired():
+                self._store_jwks_uri(
+                    requests.get(self.expected_issuer + self.oidc_endpoint, timeout=10)
+                )
+            self._store_keys(requests.get(cast("str", self._jwks_uri), timeout=10))
+
+    async def arefresh(self, client: httpx.AsyncClient) -> None:
+        """
+        Refetch the JWKS without blocking the event loop.
+
+        Callers serialize concurrent refreshes themselves.
+
+        Args:
+            client: HTTP client used for the discovery document and the JWKS
+
+        Raises:
+            requests.exceptions.HTTPError: If the issuer responded with an error
+            httpx.HTTPError: If the issuer could not be reached
+        """
+        if self._jwks_uri_expired():
+            self._store_jwks_uri(
+                await client.get(self.expected_issuer + self.oidc_endpoint)
+            )
+        self._store_keys(await client.get(cast("str", self._jwks_uri)))
+
+    def _jwks_uri_expired(self) -> bool:
+        return self._jwks_uri is None or time.monotonic() >= self._jwks_uri_expires_at
+
+    def _store_jwks_uri(self, response: requests.Response | httpx.Response) -> None:
+        """Store the jwks_uri of a discovery document response."""
+        if response.status_code != VALID_STATUS_CODE:
+            msg = f"Failed to fetch well known file: {response.status_code}"
+            raise requests.exceptions.HTTPError(msg)
+        self._jwks_uri = response.json()["jwks_uri"]
+        self._jwks_uri_expires_at = time.monotonic() + _cache_lifetime(
+            response, self.default_ttl
+        )
+
+    def _store_keys(self, response: requests.Response | httpx.Response) -> None:
+        """Parse a JWKS response and replace the cached keys."""
+        if response.status_code != VALID_STATUS_CODE:
+            msg = f"Failed to fetch JWKS: {response.status_code}"
+            raise requests.exceptions.HTTPError(msg)
+        jwks: JSONWebKeySet = response.json()
+        keys = {
+            key["kid"]: _jwk_to_rsa_key(key)
+            for key in jwks["keys"]
+            if key.get("kty") == "RSA" and "kid" in key
+        }
+        ttl = _cache_lifetime(response, self.default_ttl)
+        now = time.monotonic()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = now
+            self._refresh_at = now + ttl * self.refresh_ahead
+            self._expires_at = now + ttl
+        self.logger.info("jwks_refreshed", kids=sorted(keys), ttl=ttl)
+
+    def _refresh_in_background(self) -> None:
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._background_refresh, name="jwks-refresh", daemon=True
+        ).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            # The cached keys stay valid until they expire; the next lookup
+            # after that refetches them synchronously.
+            self.logger.exception("jwks_background_refresh_failed")
+        finally:
+            with self._lock:
+                self._refreshing = False
 
 
 class VtpmValidation:
@@ -97,6 +388,18 @@ class VtpmValidation:
             (default: /.well-known/openid-configuration)
         pki_endpoint: Path to root certificate
             (default: /.well-known/confidential_space_root.crt)
+        jwks_cache: Cache of the issuer's OIDC signing keys
+            (default: a JwksCache for expected_issuer and oidc_endpoint)
+        max_verified_chains: Number of validated x5c chains kept, so repeated
+            PKI tokens only need their signature checked (default: 256)
+        max_cached_tokens: Number of validated tokens whose claims are kept
+            until the token expires, least recently used first out (default: 4096)
+        root_fingerprint: SHA-1 fingerprint the root certificate must match, as
+            colon-separated hex (default: CERT_FINGERPRINT, the Confidential
+            Space root); override to trust another issuer, e.g. a local test issuer
+        fetch_on_demand: Whether the root certificate is fetched on first use;
+            without it, PKI tokens fail until it is pinned with `pin_root_cert`
+            (default: True)
 
     Usage:
         validator = VtpmValidation()
@@ -105,17 +408,40 @@ class VtpmValidation:
             # Claims contain verified token payload
         except VtpmValidationError as e:
             # Handle validation failure
+
+        # Batches return the claims or the error of each token
+        results = validator.validate_tokens(token_strings)
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         expected_issuer: str = "https://confidentialcomputing.googleapis.com",
         oidc_endpoint: str = "/.well-known/openid-configuration",
         pki_endpoint: str = "/.well-known/confidential_space_root.crt",
+        *,
+        jwks_cache: JwksCache | None = None,
+        max_verified_chains: int = MAX_VERIFIED_CHAINS,
+        max_cached_tokens: int = MAX_CACHED_TOKENS,
+        root_fingerprint: str = CERT_FINGERPRINT,
+        fetch_on_demand: bool = True,
     ) -> None:
         self.expected_issuer = expected_issuer
         self.oidc_endpoint = oidc_endpoint
         self.pki_endpoint = pki_endpoint
+        self.root_fingerprint = root_fingerprint.upper()
+        self.fetch_on_demand = fetch_on_demand
+        self.jwks_cache = jwks_cache or JwksCache(expected_issuer, oidc_endpoint)
+        self.max_verified_chains = max_verified_chains
+        # Digest of the x5c header -> chain that passed validation
+        self._verified_chains: dict[bytes, VerifiedChain] = {}
+        self._root_cert: x509.Certificate | None = None
+        self._root_cert_lock = threading.Lock()
+        self.max_cached_tokens = max_cached_tokens
+        # Digest of the token -> (claims, expiry as a UNIX timestamp)
+        self._claims_cache: OrderedDict[bytes, tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+        self._claims_lock = threading.Lock()
         self.logger = logger.bind(router="vtpm_validation")
 
     def validate_token(self, token: str) -> dict[str, Any]:
@@ -123,7 +449,9 @@ class VtpmValidation:
         Validates a vTPM token and returns its claims if valid.
 
         The method automatically detects whether to use PKI or OIDC validation based on
-        the presence of x5c certificates in the token header.
+        the presence of x5c certificates in the token header. Validated claims are
+        cached by token digest until the token expires, so re-validating a token
+        skips parsing and signature checks.
 
         Args:
             token: The JWT token string to validate
@@ -137,69 +465,223 @@ class VtpmValidation:
             SignatureValidationError: If the token signature is invalid
             CertificateParsingError: If certificates cannot be parsed
         """
-        unverified_header = jwt.get_unverified_header(token)
-        self.logger.info("token", unverified_header=unverified_header)
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._cached_claims(digest)
+        if claims is not None:
+            return claims
+
+        signer = self._resolve_signer(self._unverified_header(token))
+        return self._decode_with(token, digest, signer)
+
+    def validate_tokens(
+        self, tokens: Sequence[str]
+    ) -> list[dict[str, Any] | VtpmValidationError]:
+        """
+        Validates a batch of vTPM tokens.
+
+        Tokens are grouped by signer (OIDC key ID or x5c chain), and the signing
+        key of each group is resolved once, so a batch of tokens from the same
+        signer costs one key lookup or chain verification plus one signature check
+        per token. A signer that fails to resolve fails its whole group without
+        being retried. Cached tokens are answered without any work.
+
+        Args:
+            tokens: The JWT token strings to validate
+
+        Returns:
+            list: For each token, in order, its validated claims or the
+                VtpmValidationError explaining why it was rejected
+        """
+        results: list[dict[str, Any] | VtpmValidationError | None] = [None] * len(
+            tokens
+        )
+        groups: dict[tuple[str, str], list[int]] = {}
+        headers: dict[int, dict[str, Any]] = {}
+        digests: dict[int, bytes] = {}
+
+        for i, token in enumerate(tokens):
+            digests[i] = hashlib.sha256(token.encode()).digest()
+            claims = self._cached_claims(digests[i])
+            if claims is not None:
+                results[i] = claims
+                continue
+            try:
+                headers[i] = self._unverified_header(token)
+                group = self._signer_group(headers[i])
+            except VtpmValidationError as e:
+                results[i] = e
+                continue
+            groups.setdefault(group, []).append(i)
+
+        for indices in groups.values():
+            try:
+                signer = self._resolve_signer(headers[indices[0]])
+            except requests.exceptions.RequestException as e:
+                signer = VtpmValidationError(f"Failed to fetch signing keys: {e}")
+            except VtpmValidationError as e:
+                signer = e
+            for i in indices:
+                if isinstance(signer, VtpmValidationError):
+                    results[i] = signer
+                    continue
+                try:
+                    results[i] = self._decode_with(tokens[i], digests[i], signer)
+                except VtpmValidationError as e:
+                    results[i] = e
+
+        self.logger.info("validated_tokens", tokens=len(tokens), signers=len(groups))
+        return cast("list[dict[str, Any] | VtpmValidationError]", results)
+
+    def _unverified_header(self, token: str) -> dict[str, Any]:
+        """
+        Parses the token header and checks its signing algorithm.
+
+        Args:
+            token: The JWT token string
+
+        Returns:
+            dict: The unverified token header
+
+        Raises:
+            VtpmValidationError: If the header is malformed or the algorithm is
+                not ALGO
+        """
+        try:
+            unverified_header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            msg = f"Malformed token header: {e}"
+            raise VtpmValidationError(msg) from e
+        self.logger.debug("token", unverified_header=unverified_header)
 
         if unverified_header.get("alg") != ALGO:
-            msg = f"Invalid algorithm: got {unverified_header.get('alg')}, "
-            f"expected {ALGO}"
+            msg = (
+                f"Invalid algorithm: got {unverified_header.get('alg')}, "
+                f"expected {ALGO}"
+            )
             raise VtpmValidationError(msg)
+        return unverified_header
+
+    def _signer_group(self, unverified_header: dict[str, Any]) -> tuple[str, str]:
+        """
+        Returns the key tokens signed by the same signer are grouped under.
+
+        Args:
+            unverified_header: Pre-parsed token header
+
+        Returns:
+            tuple[str, str]: The scheme and the x5c chain digest or key ID
+
+        Raises:
+            VtpmValidationError: If the x5c header is malformed
+        """
+        if unverified_header.get("x5c"):
+            return ("x5c", self._chain_digest(unverified_header).hex())
+        return ("kid", str(unverified_header.get("kid")))
+
+    def _resolve_signer(
+        self, unverified_header: dict[str, Any]
+    ) -> VerifiedChain | rsa.RSAPublicKey:
+        """
+        Resolves the key a token must be signed with.
 
-        if unverified_header.get("x5c", None):
+        Args:
+            unverified_header: Pre-parsed token header
+
+        Returns:
+            VerifiedChain | RSAPublicKey: The verified x5c chain of a PKI token,
+                or the issuer's key for an OIDC token
+        """
+        if unverified_header.get("x5c"):
             # if x5c certs in header, token uses pki scheme
-            self.logger.info("PKI_token", alg=unverified_header.get("alg"))
-            return self._decode_and_validate_pki(token, unverified_header)
+            return self._resolve_chain(unverified_header)
         # token uses oidc scheme
-        self.logger.info("OIDC_token", alg=unverified_header.get("alg"))
-        return self._decode_and_validate_oidc(token, unverified_header)
+        return self._resolve_oidc_key(unverified_header)
 
-    def _decode_and_validate_oidc(
-        self, token: str, unverified_header: dict[str, str]
+    def _decode_with(
+        self, token: str, digest: bytes, signer: VerifiedChain | rsa.RSAPublicKey
     ) -> dict[str, Any]:
+        """Validates a token against its resolved signer and caches its claims."""
+        if isinstance(signer, VerifiedChain):
+            claims = self._decode_and_validate_pki(token, signer)
+            self._cache_claims(digest, claims, signer.not_valid_after)
+        else:
+            claims = self._decode_and_validate_oidc(token, signer)
+            self._cache_claims(digest, claims)
+        return dict(claims)
+
+    def _resolve_oidc_key(self, unverified_header: dict[str, Any]) -> rsa.RSAPublicKey:
         """
-        Validates a token using OIDC JWKS-based validation.
+        Looks up the OIDC signing key named by the token's key ID.
 
-        Fetches the JWKS from the issuer's endpoint, finds the matching key by key ID,
-        and validates the token signature.
+        The JWKS cache only goes to the network when the cached keys have
+        expired or the key ID is unknown.
 
         Args:
-            token: The JWT token string
             unverified_header: Pre-parsed token header
 
         Returns:
-            dict: Validated token claims if successful
+            RSAPublicKey: The issuer's public key
+
+        Raises:
+            VtpmValidationError: If the header has no known key ID
+        """
+        kid = unverified_header.get("kid")
+        if not kid:
+            msg = "Token header has no key id (kid)"
+            raise VtpmValidationError(msg)
+        rsa_key = self.jwks_cache.get_key(kid)
+        self.logger.debug("kid_match", kid=kid)
+        return rsa_key
+
+    def _resolve_chain(self, unverified_header: dict[str, Any]) -> VerifiedChain:
+        """
+        Validates the token's x5c certificate chain against the pinned root.
+
+        Chains that passed validation are cached by the digest of the x5c
+        header until their first certificate expires.
+
+        Args:
+            unverified_header: Pre-parsed token header containing x5c certificates
+
+        Returns:
+            VerifiedChain: The leaf public key and expiry of the chain
 
         Raises:
             VtpmValidationError: For any validation failure
-            SignatureValidationError: If signature validation fails
+            InvalidCertificateChainError: If certificate chain validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.oidc_endpoint).json()
-        jwks_uri = res["jwks_uri"]
+        root_cert = self._pinned_root_cert()
+        try:
+            return self._verified_chain(unverified_header, root_cert)
+        except VtpmValidationError:
+            raise
+        except Exception as e:
+            msg = f"Unexpected error during validation: {e}"
+            raise VtpmValidationError(msg) from e
 
-        jwks = self._fetch_jwks(jwks_uri)
-        rsa_key = None
+    def _decode_and_validate_oidc(
+        self, token: str, rsa_key: rsa.RSAPublicKey
+    ) -> dict[str, Any]:
+        """
+        Validates a token signed with an OIDC JWKS key.
 
-        # Find the correct key based on the key ID (kid) in header
-        for key in jwks["keys"]:
-            if key.get("kid") == unverified_header["kid"]:
-                self.logger.info("kid_match", kid=key["kid"])
-                rsa_key = self._jwk_to_rsa_key(key)
-                break
+        Args:
+            token: The JWT token string
+            rsa_key: The issuer's public key named by the token's key ID
 
-        if rsa_key is None:
-            msg = "Unable to find appropriate key id (kid) in header"
-            raise VtpmValidationError(msg)
+        Returns:
+            dict: Validated token claims if successful
 
+        Raises:
+            VtpmValidationError: For any validation failure
+            SignatureValidationError: If signature validation fails
+        """
         # Verify and decode the token using the public RSA key
         try:
             validated_token = jwt.decode(
                 token, rsa_key, algorithms=[ALGO], options={"verify_aud": False}
             )
-            self.logger.info(
-                "signature_match",
-                issuer=self.expected_issuer,
-                public_numbers=rsa_key.public_numbers,
-            )
+            self.logger.debug("signature_match", issuer=self.expected_issuer)
         except jwt.ExpiredSignatureError as e:
             msg = "Token has expired"
             self.logger.exception("token_expired", error=e)
@@ -216,51 +698,25 @@ class VtpmValidation:
             return validated_token
 
     def _decode_and_validate_pki(
-        self, token: str, unverified_header: dict[str, str]
+        self, token: str, chain: VerifiedChain
     ) -> dict[str, Any]:
         """
-        Validates a token using PKI-based validation.
-
-        Validates the certificate chain from the x5c header, verifies it
-        against the trusted root certificate, and validates the token
-        signature using the leaf certificate.
+        Validates a token signed by the leaf certificate of a verified chain.
 
         Args:
             token: The JWT token string
-            unverified_header: Pre-parsed token header containing x5c certificates
+            chain: The token's x5c chain, already validated by _resolve_chain
 
         Returns:
             dict: Validated token claims if successful
 
         Raises:
             VtpmValidationError: For any validation failure
-            InvalidCertificateChainError: If certificate chain validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.pki_endpoint).content
-        root_cert = x509.load_pem_x509_certificate(res, default_backend())
-        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
-        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
-
-        if calculated_fingerprint != CERT_FINGERPRINT:
-            msg = "Root certificate fingerprint does not match expected fingerprint."
-            f"Expected: {CERT_FINGERPRINT}, Received: {calculated_fingerprint}"
-            raise VtpmValidationError(msg)
         try:
-            certs = self._extract_and_validate_certificates(unverified_header)
-            self._validate_leaf_certificate(certs.leaf_cert)
-            self._compare_root_certificates(certs.root_cert, root_cert)
-            self._check_certificate_validity(certs)
-            self._verify_certificate_chain(certs)
-
-            public_key = certs.leaf_cert.public_key()
-            public_pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo,
-            )
-
             return jwt.decode(
                 token,
-                key=public_pem,
+                key=chain.public_key,
                 algorithms=[ALGO],
             )
         except (InvalidKey, jwt.InvalidTokenError) as e:
@@ -270,77 +726,214 @@ class VtpmValidation:
             msg = f"Unexpected error during validation: {e}"
             raise VtpmValidationError(msg) from e
 
-    @staticmethod
-    def _get_well_known_file(
-        expected_issuer: str, well_known_path: str
-    ) -> requests.Response:
+    def _cached_claims(self, digest: bytes) -> dict[str, Any] | None:
+        """Return a copy of the cached claims of an unexpired token, if any."""
+        with self._claims_lock:
+            entry = self._claims_cache.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._claims_cache[digest]
+                return None
+            self._claims_cache.move_to_end(digest)
+        return dict(claims)
+
+    def _cache_claims(
+        self,
+        digest: bytes,
+        claims: dict[str, Any],
+        not_valid_after: datetime.datetime | None = None,
+    ) -> None:
         """
-        Fetch configuration data from a well-known endpoint.
+        Cache validated claims until the token (or its certificate chain) expires.
 
-        This static method retrieves data from a well-known URL endpoint by combining
-        the issuer URL with the well-known path.
+        Tokens without a numeric `exp` claim are not cached.
+        """
+        exp = claims.get("exp")
+        if self.max_cached_tokens <= 0 or not isinstance(exp, int | float):
+            return
+        expires_at = float(exp)
+        if not_valid_after is not None:
+            expires_at = min(expires_at, not_valid_after.timestamp())
+        with self._claims_lock:
+            self._claims_cache[digest] = (claims, expires_at)
+            self._claims_cache.move_to_end(digest)
+            while len(self._claims_cache) > self.max_cached_tokens:
+                self._claims_cache.popitem(last=False)
+
+    def _verified_chain(
+        self, headers: dict[str, Any], root_cert: x509.Certificate
+    ) -> VerifiedChain:
+        """
+        Return the validated certificate chain of the token header.
+
+        Chains are validated once and then served from the cache until the
+        earliest `not_valid_after` of their certificates.
 
         Args:
-            expected_issuer: Base URL of the token issuer
-                (e.g., "https://confidentialcomputing.googleapis.com")
-            well_known_path: Path to the well-known endpoint
-                (e.g., "/.well-known/openid-configuration")
+            headers: Token header dictionary with x5c field with certificate chain
+            root_cert: The pinned root certificate
 
         Returns:
-            requests.Response: The HTTP response from the well-known endpoint
+            VerifiedChain: The leaf public key and expiry of the chain
 
         Raises:
-            requests.exceptions.HTTPError: If the response status code is not 200
+            VtpmValidationError: If the chain fails validation
         """
-        response = requests.get(expected_issuer + well_known_path, timeout=10)
-        valid_status_code = 200
-        if response.status_code == valid_status_code:
-            return response
-        msg = f"Failed to fetch well known file: {response.status_code}"
-        raise requests.exceptions.HTTPError(msg)
+        digest = self._chain_digest(headers)
+        current_time = datetime.datetime.now(tz=datetime.UTC)
+
+        chain = self._verified_chains.get(digest)
+        if chain is not None and current_time <= chain.not_valid_after:
+            return chain
+
+        certs = self._extract_and_validate_certificates(headers)
+        self._validate_leaf_certificate(certs.leaf_cert)
+        self._compare_root_certificates(certs.root_cert, root_cert)
+        self._check_certificate_validity(certs)
+        self._verify_certificate_chain(certs)
+
+        public_key = certs.leaf_cert.public_key()
+        if not isinstance(public_key, rsa.RSAPublicKey):
+            msg = "Leaf certificate must use RSA public key"
+            raise SignatureValidationError(msg)
+        chain = VerifiedChain(
+            public_key=public_key,
+            not_valid_after=min(
+                cert.not_valid_after_utc
+                for cert in (
+                    certs.leaf_cert,
+                    certs.intermediate_cert,
+                    certs.root_cert,
+                )
+            ),
+        )
+        self._cache_chain(digest, chain, current_time)
+        return chain
 
     @staticmethod
-    def _fetch_jwks(uri: str) -> JSONWebKeySet:
+    def _chain_digest(headers: dict[str, Any]) -> bytes:
         """
-        Fetch JSON Web Key Set (JWKS) from a remote endpoint.
+        Return the digest the x5c chain of a token header is cached under.
 
-        This static method retrieves and parses the JWKS containing public keys
-        used for token validation.
+        Args:
+            headers: Token header dictionary with x5c field with certificate chain
+
+        Returns:
+            bytes: SHA-256 digest of the x5c certificates
+
+        Raises:
+            VtpmValidationError: If x5c is not a list of certificate strings
+        """
+        x5c_headers = headers.get("x5c") or []
+        if not isinstance(x5c_headers, list) or not all(
+            isinstance(cert, str) for cert in x5c_headers
+        ):
+            msg = "Malformed x5c header: expected a list of certificates"
+            raise VtpmValidationError(msg)
+        return hashlib.sha256("\n".join(x5c_headers).encode()).digest()
+
+    def _cache_chain(
+        self, digest: bytes, chain: VerifiedChain, current_time: datetime.datetime
+    ) -> None:
+        """Cache a verified chain, evicting expired and then the oldest chains."""
+        self._verified_chains.pop(digest, None)
+        if len(self._verified_chains) >= self.max_verified_chains:
+            for key, cached in list(self._verified_chains.items()):
+                if cached.not_valid_after < current_time:
+                    self._verified_chains.pop(key, None)
+        while len(self._verified_chains) >= self.max_verified_chains:
+            self._verified_chains.pop(next(iter(self._verified_chains)), None)
+        if self.max_verified_chains > 0:
+            self._verified_chains[digest] = chain
+
+    @property
+    def pinned_root_cert(self) -> x509.Certificate | None:
+        """The trusted root certificate, or None before it has been fetched."""
+        return self._root_cert
+
+    def _pinned_root_cert(self) -> x509.Certificate:
+        """
+        Return the trusted root certificate, fetching it on first use.
+
+        Returns:
+            x509.Certificate: The trusted root certificate
+
+        Raises:
+            VtpmValidationError: If the fingerprint does not match, or the
+                certificate has not been pinned and `fetch_on_demand` is off
+            requests.exceptions.HTTPError: If the certificate could not be fetched
+        """
+        with self._root_cert_lock:
+            if self._root_cert is not None:
+                return self._root_cert
+            if not self.fetch_on_demand:
+                msg = "Root certificate has not been fetched"
+                raise VtpmValidationError(msg)
+            res = self._get_well_known_file(
+                self.expected_issuer, self.pki_endpoint
+            ).content
+            return self.pin_root_cert(res)
+
+    def pin_root_cert(self, pem: bytes) -> x509.Certificate:
+        """
+        Check a root certificate against the trusted fingerprint and pin it.
+
+        The pinned certificate is kept for the lifetime of the validator.
 
         Args:
-            uri: Full URL of the JWKS endpoint
+            pem: PEM-encoded root certificate from the well-known endpoint
 
         Returns:
-            JWKSResponse: Parsed JWKS data containing public keys
+            x509.Certificate: The trusted root certificate
 
         Raises:
-            requests.exceptions.HTTPError: If the response status code is not 200
+            VtpmValidationError: If the fingerprint does not match
         """
-        response = requests.get(uri, timeout=10)
-        valid_status_code = 200
-        if response.status_code == valid_status_code:
-            return response.json()
-        msg = f"Failed to fetch JWKS: {response.status_code}"
-        raise requests.exceptions.HTTPError(msg)
+        root_cert = x509.load_pem_x509_certificate(pem, default_backend())
+        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
+        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
+
+        if calculated_fingerprint != self.root_fingerprint:
+            msg = (
+                "Root certificate fingerprint does not match expected "
+                f"fingerprint. Expected: {self.root_fingerprint}, "
+                f"Received: {calculated_fingerprint}"
+            )
+            raise VtpmValidationError(msg)
+        self.logger.info("root_cert_pinned", fingerprint=calculated_fingerprint)
+        self._root_cert = root_cert
+        return root_cert
 
     @staticmethod
-    def _jwk_to_rsa_key(jwk: dict[str, str]) -> rsa.RSAPublicKey:
+    def _get_well_known_file(
+        expected_issuer: str, well_known_path: str
+    ) -> requests.Response:
         """
-        Convert a JSON Web Key (JWK) to an RSA public key.
+        Fetch configuration data from a well-known endpoint.
 
-        This static method converts a JWK dictionary into a cryptographic RSA public key
-        by extracting and decoding the modulus (n) and exponent (e) values.
+        This static method retrieves data from a well-known URL endpoint by combining
+        the issuer URL with the well-known path.
 
         Args:
-            jwk: Dictionary containing the JWK parameters, must include 'n' (modulus)
-                and 'e' (exponent) fields in base64url encoding
+            expected_issuer: Base URL of the token issuer
+                (e.g., "https://confidentialcomputing.googleapis.com")
+            well_known_path: Path to the well-known endpoint
+                (e.g., "/.well-known/openid-configuration")
 
         Returns:
-            RSAPublicKey: A cryptographic RSA public key object
+            requests.Response: The HTTP response from the well-known endpoint
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status code is not 200
         """
-        n = int.from_bytes(base64.urlsafe_b64decode(jwk["n"] + "=="), "big")
-        e = int.from_bytes(base64.urlsafe_b64decode(jwk["e"] + "=="), "big")
-        return rsa.RSAPublicNumbers(e, n).public_key(backend=default_backend())
+        response = requests.get(expected_issuer + well_known_path, timeout=10)
+        valid_status_code = 200
+        if response.status_code == valid_status_code:
+            return response
+        msg = f"Failed to fetch well known file: {response.status_code}"
+        raise requests.exceptions.HTTPError(msg)
 
     def _extract_and_validate_certificates(
         self, headers: dict[str, Any]
@@ -522,3 +1115,192 @@ class VtpmValidation:
         not_before = cert.not_valid_before_utc.replace(tzinfo=datetime.UTC)
         not_after = cert.not_valid_after_utc.replace(tzinfo=datetime.UTC)
         return not_before <= current_time <= not_after
+
+
+class AsyncVtpmValidation:
+    """
+    Validates vTPM tokens without blocking the event loop.
+
+    Wraps a VtpmValidation and fetches everything it needs from the issuer
+    (root certificate, OIDC discovery document and JWKS) over an async httpx
+    client before handing the token to it. The wrapped validator is switched
+    to no-fetch mode, so it only ever does local work: cache lookups and
+    signature checks. Tokens whose root certificate or signing key could not
+    be fetched are rejected with a VtpmValidationError naming the cause. Stale
+    keys are refreshed in a background task while the cached ones keep being
+    served.
+
+    Args:
+        validator: Validator whose caches and checks are used, switched to
+            no-fetch mode (default: a new VtpmValidation)
+        client: HTTP client for the issuer (default: a new httpx.AsyncClient,
+            closed by `aclose`)
+
+    Usage:
+        async with AsyncVtpmValidation() as validator:
+            claims = await validator.validate_token(token_string)
+    """
+
+    def __init__(
+        self,
+        validator: VtpmValidation | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        validator = validator or VtpmValidation()
+        # Everything is fetched here; the validator never goes to the network
+        validator.fetch_on_demand = False
+        validator.jwks_cache.fetch_on_demand = False
+        validator.jwks_cache.background_refresh = False
+        self.validator = validator
+        self._client = client or httpx.AsyncClient(timeout=10)
+        self._owns_client = client is None
+        self._fetch_lock = asyncio.Lock()
+        self._background_refresh: asyncio.Task[None] | None = None
+        self.logger = logger.bind(router="async_vtpm_validation")
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop a running background refresh and close the owned HTTP client."""
+        if self._background_refresh is not None:
+            self._background_refresh.cancel()
+            await asyncio.gather(self._background_refresh, return_exceptions=True)
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def validate_token(self, token: str) -> dict[str, Any]:
+        """
+        Validates a vTPM token and returns its claims if valid.
+
+        Args:
+            token: The JWT token string to validate
+
+        Returns:
+            dict: The validated token claims
+
+        Raises:
+            VtpmValidationError: If token validation fails for any reason,
+                including the issuer being unreachable
+        """
+        errors = await self._prefetch([token])
+        if errors:
+            raise errors[0]
+        return self.validator.validate_token(token)
+
+    async def validate_tokens(
+        self, tokens: Sequence[str]
+    ) -> list[dict[str, Any] | VtpmValidationError]:
+        """
+        Validates a batch of vTPM tokens, see VtpmValidation.validate_tokens.
+
+        Args:
+            tokens: The JWT token strings to validate
+
+        Returns:
+            list: For each token, in order, its validated claims or the
+                VtpmValidationError explaining why it was rejected
+        """
+        results: dict[int, dict[str, Any] | VtpmValidationError] = dict(
+            await self._prefetch(tokens)
+        )
+        pending = [i for i in range(len(tokens)) if i not in results]
+        validated = self.validator.validate_tokens([tokens[i] for i in pending])
+        results.update(zip(pending, validated, strict=True))
+        return [results[i] for i in range(len(tokens))]
+
+    async def _prefetch(self, tokens: Sequence[str]) -> dict[int, VtpmValidationError]:
+        """
+        Fetch the root certificate and signing keys the tokens need.
+
+        Args:
+            tokens: The JWT token strings about to be validated
+
+        Returns:
+            dict: Token index -> error, for the tokens whose root certificate or
+                signing key could not be fetched
+        """
+        pki: list[int] = []
+        kids: dict[int, str] = {}
+        for i, token in enumerate(tokens):
+            try:
+                header = jwt.get_unverified_header(token)
+            except jwt.InvalidTokenError:
+                continue
+            if header.get("x5c"):
+                pki.append(i)
+            elif isinstance(header.get("kid"), str):
+                kids[i] = header["kid"]
+
+        return {
+            **await self._prefetch_root_cert(pki),
+            **await self._prefetch_keys(kids),
+        }
+
+    async def _prefetch_root_cert(
+        self, pki: list[int]
+    ) -> dict[int, VtpmValidationError]:
+        """Pin the root certificate if PKI tokens need it, see _prefetch."""
+        if not pki or self.validator.pinned_root_cert is not None:
+            return {}
+        try:
+            await self._fetch_root_cert()
+        except VtpmValidationError as e:
+            return dict.fromkeys(pki, e)
+        except FETCH_ERRORS as e:
+            self.logger.exception("root_cert_fetch_failed")
+            return dict.fromkeys(
+                pki, VtpmValidationError(f"Failed to fetch root certificate: {e}")
+            )
+        return {}
+
+    async def _prefetch_keys(
+        self, kids: dict[int, str]
+    ) -> dict[int, VtpmValidationError]:
+        """Refresh the signing keys if OIDC tokens need it, see _prefetch."""
+        cache = self.validator.jwks_cache
+        wanted = set(kids.values())
+        try:
+            if any(cache.needs_fetch(kid) for kid in wanted):
+                await self._refresh_keys(wanted)
+            elif wanted and cache.is_stale():
+                self._refresh_keys_in_background()
+        except FETCH_ERRORS as e:
+            self.logger.exception("jwks_fetch_failed")
+            error = VtpmValidationError(f"Failed to fetch signing keys: {e}")
+            # Tokens whose key is still cached and unexpired are unaffected
+            return {i: error for i, kid in kids.items() if cache.needs_fetch(kid)}
+        return {}
+
+    async def _fetch_root_cert(self) -> None:
+        async with self._fetch_lock:
+            if self.validator.pinned_root_cert is not None:
+                return
+            response = await self._client.get(
+                self.validator.expected_issuer + self.validator.pki_endpoint
+            )
+            if response.status_code != VALID_STATUS_CODE:
+                msg = f"Failed to fetch well known file: {response.status_code}"
+                raise requests.exceptions.HTTPError(msg)
+            self.validator.pin_root_cert(response.content)
+
+    async def _refresh_keys(self, kids: set[str] | None = None) -> None:
+        cache = self.validator.jwks_cache
+        async with self._fetch_lock:
+            # Another task may have refreshed the keys while we waited
+            if kids is None or any(cache.needs_fetch(kid) for kid in kids):
+                await cache.arefresh(self._client)
+
+    def _refresh_keys_in_background(self) -> None:
+        if self._background_refresh is None or self._background_refresh.done():
+            self._background_refresh = asyncio.create_task(self._background())
+
+    async def _background(self) -> None:
+        try:
+            await self._refresh_keys()
+        except FETCH_ERRORS:
+            # The cached keys stay valid until they expire
+            self.logger.exception("jwks_background_refresh_failed")
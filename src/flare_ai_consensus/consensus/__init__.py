@@ -1,9 +1,38 @@
-from .aggregator import async_centralized_llm_aggregator, centralized_llm_aggregator
-from .consensus import run_consensus, send_round
+from .aggregator import (
+    LOCAL_AGGREGATORS,
+    LocalAggregate,
+    aggregate_responses,
+    async_centralized_llm_aggregator,
+    centralized_llm_aggregator,
+)
+from .batch import BatchResult, FairScheduler, run_consensus_batch
+from .consensus import (
+    ConsensusUpdate,
+    QuorumNotReachedError,
+    RoundResult,
+    run_consensus,
+    run_consensus_progressive,
+    send_round,
+)
+from .jobs import ConsensusJob, ConsensusJobQueue, JobQueueFullError, JobStatus
 
 __all__ = [
+    "BatchResult",
+    "ConsensusJob",
+    "ConsensusJobQueue",
+    "ConsensusUpdate",
+    "FairScheduler",
+    "JobQueueFullError",
+    "JobStatus",
+    "LOCAL_AGGREGATORS",
+    "LocalAggregate",
+    "QuorumNotReachedError",
+    "RoundResult",
+    "aggregate_responses",
     "async_centralized_llm_aggregator",
     "centralized_llm_aggregator",
     "run_consensus",
+    "run_consensus_batch",
+    "run_consensus_progressive",
     "send_round",
 ]
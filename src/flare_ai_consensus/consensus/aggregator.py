@@ -1,19 +1,141 @@
+import asyncio
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import batched
+
+import numpy as np
+import structlog
+
+from flare_ai_consensus.consensus.compaction import compact_responses
+from flare_ai_consensus.consensus.dedup import cluster_near_duplicates
+from flare_ai_consensus.consensus.similarity import similarity_matrix
 from flare_ai_consensus.router import (
     AsyncOpenRouterProvider,
     ChatRequest,
     OpenRouterProvider,
 )
 from flare_ai_consensus.settings import AggregatorConfig, Message
+from flare_ai_consensus.utils.token_utils import (
+    estimate_message_tokens,
+    estimate_tokens,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Similarity at which two responses are placed in the same cluster
+CLUSTER_SIMILARITY = 0.7
+
+# Share of the aggregator's context kept free for estimation error
+CONTEXT_SAFETY_MARGIN = 0.05
+
+RESPONSES_HEADER = "Aggregated responses:\n"
 
 
-def _concatenate_aggregator(responses: dict[str, str]) -> str:
+@dataclass(frozen=True)
+class LocalAggregate:
+    """
+    Result of a local (LLM-free) aggregator.
+
+    Attributes:
+        response: The selected response text
+        confidence: Score in [0, 1] of how strongly the responses support it
+    """
+
+    response: str
+    confidence: float
+
+
+def _label(model: str, weights: dict[str, int] | None) -> str:
+    weight = weights.get(model, 1) if weights else 1
+    return f"{model} (given by {weight} models)" if weight > 1 else model
+
+
+def _concatenate_aggregator(
+    responses: dict[str, str], weights: dict[str, int] | None = None
+) -> str:
     """
     Aggregate responses by concatenating each model's answer with a label.
 
     :param responses: A dictionary mapping model IDs to their response texts.
+    :param weights: Optional number of models each response stands for.
     :return: A single aggregated string.
     """
-    return "\n\n".join([f"{model}: {text}" for model, text in responses.items()])
+    return "\n\n".join(
+        [f"{_label(model, weights)}: {text}" for model, text in responses.items()]
+    )
+
+
+def _response_budget(
+    aggregator_config: AggregatorConfig, fixed_messages: list[Message]
+) -> int | None:
+    """
+    Return the tokens available for responses in the aggregator prompt.
+
+    :param aggregator_config: An instance of AggregatorConfig.
+    :param fixed_messages: The context and prompt messages around the responses.
+    :return: The token budget, or None if the context length is unknown.
+    """
+    model = aggregator_config.model
+    if model.context_length is None:
+        return None
+    usable = int(model.context_length * (1 - CONTEXT_SAFETY_MARGIN))
+    fixed = estimate_message_tokens(fixed_messages, model.model_id)
+    return usable - model.max_tokens - fixed
+
+
+def build_aggregator_messages(
+    aggregator_config: AggregatorConfig,
+    responses: dict[str, str],
+    weights: dict[str, int] | None = None,
+) -> list[Message]:
+    """
+    Build the aggregator prompt, compacting responses to fit its context.
+
+    The prompt consists of the aggregator context, a system message with the
+    labelled responses and the aggregator prompt. If the aggregator model has
+    a `context_length`, responses are compacted so that the prompt plus
+    `max_tokens` of completion fit into it.
+
+    :param aggregator_config: An instance of AggregatorConfig.
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :param weights: Optional number of models each response stands for, shown
+        in the response labels.
+    :return: The list of messages for the aggregator.
+    :raises ValueError: If the aggregator's `context_length` leaves no room
+        for the responses.
+    """
+    fixed: list[Message] = [
+        *aggregator_config.context,
+        {"role": "system", "content": RESPONSES_HEADER},
+        *aggregator_config.prompt,
+    ]
+    budget = _response_budget(aggregator_config, fixed)
+    if budget is not None:
+        model_id = aggregator_config.model.model_id
+        labels = sum(
+            estimate_tokens(f"{_label(m, weights)}: \n\n", model_id) for m in responses
+        )
+        if budget - labels <= 0:
+            msg = (
+                f"Aggregator {model_id} has no room for responses: context_length "
+                f"{aggregator_config.model.context_length} does not cover max_tokens "
+                f"{aggregator_config.model.max_tokens} and the aggregator prompt"
+            )
+            raise ValueError(msg)
+        responses = compact_responses(responses, budget - labels, model_id)
+
+    messages: list[Message] = []
+    messages.extend(aggregator_config.context)
+    messages.append(
+        {
+            "role": "system",
+            "content": RESPONSES_HEADER + _concatenate_aggregator(responses, weights),
+        }
+    )
+    messages.extend(aggregator_config.prompt)
+    return messages
 
 
 def centralized_llm_aggregator(
@@ -29,18 +151,8 @@ def centralized_llm_aggregator(
         responses from individual models.
     :return: The aggregator's combined response.
     """
-    # Build the message list.
-    messages: list[Message] = []
-    messages.extend(aggregator_config.context)
-
-    # Add a system message with the aggregated responses.
-    aggregated_str = _concatenate_aggregator(aggregated_responses)
-    messages.append(
-        {"role": "system", "content": f"Aggregated responses:\n{aggregated_str}"}
-    )
-
-    # Add the aggregator prompt
-    messages.extend(aggregator_config.prompt)
+    # Build the message list, compacting the responses to the token budget.
+    messages = build_aggregator_messages(aggregator_config, aggregated_responses)
 
     payload: ChatRequest = {
         "model": aggregator_config.model.model_id,
@@ -58,6 +170,7 @@ async def async_centralized_llm_aggregator(
     provider: AsyncOpenRouterProvider,
     aggregator_config: AggregatorConfig,
     aggregated_responses: dict[str, str],
+    weights: dict[str, int] | None = None,
 ) -> str:
     """
     Use a centralized LLM (via an async provider) to combine responses.
@@ -66,14 +179,12 @@ async def async_centralized_llm_aggregator(
     :param aggregator_config: An instance of AggregatorConfig.
     :param aggregated_responses: A string containing aggregated
         responses from individual models.
+    :param weights: Optional number of models each response stands for.
     :return: The aggregator's combined response as a string.
     """
-    messages = []
-    messages.extend(aggregator_config.context)
-    messages.append(
-        {"role": "system", "content": f"Aggregated responses:\n{aggregated_responses}"}
+    messages = build_aggregator_messages(
+        aggregator_config, aggregated_responses, weights
     )
-    messages.extend(aggregator_config.prompt)
 
     payload: ChatRequest = {
         "model": aggregator_config.model.model_id,
@@ -82,5 +193,212 @@ async def async_centralized_llm_aggregator(
         "temperature": aggregator_config.model.temperature,
     }
 
-    response = await provider.send_chat_completion(payload)
+    response = await provider.send_chat_completion(
+        payload, cache=aggregator_config.model.cacheable or None
+    )
     return response.get("choices", [])[0].get("message", {}).get("content", "")
+
+
+def medoid_aggregator(responses: dict[str, str]) -> LocalAggregate:
+    """
+    Select the response most similar on average to all other responses.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :return: The medoid response, with its mean similarity as confidence.
+    """
+    texts = list(responses.values())
+    if len(texts) <= 1:
+        return LocalAggregate(texts[0] if texts else "", 1.0 if texts else 0.0)
+    matrix = similarity_matrix(texts)
+    mean_similarity = (matrix.sum(axis=1) - matrix.diagonal()) / (len(texts) - 1)
+    best = int(np.argmax(mean_similarity))
+    return LocalAggregate(texts[best], float(mean_similarity[best]))
+
+
+def majority_cluster_aggregator(responses: dict[str, str]) -> LocalAggregate:
+    """
+    Vote between clusters of similar responses.
+
+    Each response's cluster holds the responses at least `CLUSTER_SIMILARITY`
+    similar to it; the largest cluster wins and its medoid is returned.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :return: The winning cluster's medoid, with the cluster's share of the
+        responses as confidence.
+    """
+    texts = list(responses.values())
+    if not texts:
+        return LocalAggregate("", 0.0)
+    matrix = similarity_matrix(texts)
+    members = matrix >= CLUSTER_SIMILARITY
+    np.fill_diagonal(members, val=True)
+    sizes = members.sum(axis=1)
+    cluster = np.flatnonzero(members[int(np.argmax(sizes))])
+    within = matrix[np.ix_(cluster, cluster)].sum(axis=1)
+    best = int(cluster[np.argmax(within)])
+    return LocalAggregate(texts[best], len(cluster) / len(texts))
+
+
+def _normalize_answer(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower()).rstrip(".!?")
+
+
+def exact_match_aggregator(responses: dict[str, str]) -> LocalAggregate:
+    """
+    Vote between responses that are identical after normalisation.
+
+    Intended for short answers (numbers, labels, yes/no); case, surrounding
+    whitespace and trailing punctuation are ignored.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :return: The most common answer, with its share of the votes as confidence.
+    """
+    texts = list(responses.values())
+    if not texts:
+        return LocalAggregate("", 0.0)
+    votes = Counter(_normalize_answer(text) for text in texts)
+    answer, count = votes.most_common(1)[0]
+    response = next(text for text in texts if _normalize_answer(text) == answer)
+    return LocalAggregate(response, count / len(texts))
+
+
+# Local aggregators selectable through AggregatorConfig.approach
+LOCAL_AGGREGATORS: dict[str, Callable[[dict[str, str]], LocalAggregate]] = {
+    "medoid": medoid_aggregator,
+    "majority": majority_cluster_aggregator,
+    "exact_match": exact_match_aggregator,
+}
+
+
+async def aggregate_responses(
+    provider: AsyncOpenRouterProvider,
+    aggregator_config: AggregatorConfig,
+    responses: dict[str, str],
+) -> str:
+    """
+    Aggregate responses with the approach selected in the aggregator config.
+
+    Local approaches (see `LOCAL_AGGREGATORS`) run in-process; their result is
+    used when its confidence reaches `aggregator_config.confidence_threshold`,
+    otherwise the centralized LLM aggregator is called. Any other approach
+    uses the centralized LLM aggregator directly. Before an LLM call,
+    near-duplicate responses are collapsed if
+    `aggregator_config.dedup_threshold` is set.
+
+    :param provider: An asynchronous OpenRouterProvider.
+    :param aggregator_config: An instance of AggregatorConfig.
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :return: The aggregated response as a string.
+    """
+    local_aggregator = LOCAL_AGGREGATORS.get(aggregator_config.approach)
+    if local_aggregator is not None:
+        local = local_aggregator(responses)
+        if local.confidence >= aggregator_config.confidence_threshold:
+            logger.info(
+                "aggregated locally",
+                approach=aggregator_config.approach,
+                confidence=round(local.confidence, 3),
+            )
+            return local.response
+        logger.info(
+            "local aggregation not confident, falling back to llm",
+            approach=aggregator_config.approach,
+            confidence=round(local.confidence, 3),
+        )
+    weights = None
+    if aggregator_config.dedup_threshold is not None:
+        responses, weights = collapse_near_duplicates(
+            responses, aggregator_config.dedup_threshold
+        )
+    if aggregator_config.fan_in is not None:
+        return await tree_llm_aggregator(
+            provider, aggregator_config, responses, aggregator_config.fan_in, weights
+        )
+    return await async_centralized_llm_aggregator(
+        provider, aggregator_config, responses, weights
+    )
+
+
+def collapse_near_duplicates(
+    responses: dict[str, str], threshold: float
+) -> tuple[dict[str, str], dict[str, int]]:
+    """
+    Keep one representative response per cluster of near-duplicates.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :param threshold: Minimum estimated Jaccard similarity of near-duplicates.
+    :return: The representative responses, and the size of each cluster keyed
+        by its representative's model ID.
+    """
+    clusters = cluster_near_duplicates(responses, threshold)
+    if len(clusters) < len(responses):
+        logger.info(
+            "collapsed near-duplicate responses",
+            responses=len(responses),
+            clusters=len(clusters),
+        )
+    return (
+        {c.representative: c.text for c in clusters},
+        {c.representative: c.weight for c in clusters},
+    )
+
+
+async def tree_llm_aggregator(
+    provider: AsyncOpenRouterProvider,
+    aggregator_config: AggregatorConfig,
+    responses: dict[str, str],
+    fan_in: int,
+    weights: dict[str, int] | None = None,
+) -> str:
+    """
+    Aggregate responses in a tree of LLM calls with at most `fan_in` inputs each.
+
+    Responses are split into groups of `fan_in` that are aggregated in
+    parallel; the partial aggregates are grouped and aggregated again until a
+    single aggregate remains. A group with a single member is passed up
+    unchanged. Each partial aggregate is weighted by the sum of the weights
+    of its inputs.
+
+    :param provider: An asynchronous OpenRouterProvider.
+    :param aggregator_config: An instance of AggregatorConfig.
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :param fan_in: Maximum number of responses per aggregator call (at least 2).
+    :param weights: Optional number of models each response stands for.
+    :return: The aggregated response as a string.
+    :raises ValueError: If `fan_in` is smaller than 2.
+    """
+    if fan_in < 2:  # noqa: PLR2004
+        msg = f"fan_in must be at least 2, got {fan_in}"
+        raise ValueError(msg)
+
+    weights = weights or dict.fromkeys(responses, 1)
+    level = 0
+    while len(responses) > fan_in:
+        groups = [dict(group) for group in batched(responses.items(), fan_in)]
+        logger.info("aggregating tree level", depth=level, groups=len(groups))
+        partials = await asyncio.gather(
+            *(
+                async_centralized_llm_aggregator(
+                    provider,
+                    aggregator_config,
+                    group,
+                    {m: weights.get(m, 1) for m in group},
+                )
+                for group in groups
+                if len(group) > 1
+            )
+        )
+        # Singleton groups are carried up to the next level unchanged.
+        texts = iter(partials)
+        next_responses, next_weights = {}, {}
+        for i, group in enumerate(groups):
+            key = f"aggregate_{level}_{i}"
+            next_responses[key] = (
+                next(texts) if len(group) > 1 else next(iter(group.values()))
+            )
+            next_weights[key] = sum(weights.get(m, 1) for m in group)
+        responses, weights = next_responses, next_weights
+        level += 1
+    return await async_centralized_llm_aggregator(
+        provider, aggregator_config, responses, weights
+    )
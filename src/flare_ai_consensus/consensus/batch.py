@@ -0,0 +1,230 @@
+import asyncio
+import itertools
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncGenerator, AsyncIterator, Hashable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, cast
+
+import structlog
+
+from flare_ai_consensus.consensus.consensus import run_consensus
+from flare_ai_consensus.router import AsyncOpenRouterProvider
+from flare_ai_consensus.settings import ConsensusConfig, Message
+from flare_ai_consensus.utils import TraceWriter
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one conversation of a consensus batch.
+
+    Attributes:
+        index: Position of the conversation in the input
+        aggregated_response: The final aggregated response, if the run succeeded
+        error: The error message, if the run failed
+    """
+
+    index: int
+    aggregated_response: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class _Waiter:
+    model_id: str
+    future: asyncio.Future[None]
+
+
+class FairScheduler:
+    """
+    Concurrency slots for model calls, shared fairly between prompts.
+
+    At most `max_concurrency` calls run at once, and at most
+    `per_model_concurrency` per model id. Free slots are handed out
+    round-robin between prompts with waiting calls, so a prompt with many
+    queued calls cannot starve the others.
+    """
+
+    def __init__(
+        self, max_concurrency: int, per_model_concurrency: int | None = None
+    ) -> None:
+        """
+        :param max_concurrency: Maximum number of concurrent calls.
+        :param per_model_concurrency: Maximum concurrent calls per model id,
+            or None for no per-model cap.
+        """
+        self.max_concurrency = max_concurrency
+        self.per_model_concurrency = per_model_concurrency
+        self.running = 0
+        self._running_per_model: Counter[str] = Counter()
+        self._waiting: OrderedDict[Hashable, deque[_Waiter]] = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot."""
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def running_for(self, model_id: str) -> int:
+        """Return the number of calls to `model_id` holding a slot."""
+        return self._running_per_model[model_id]
+
+    @asynccontextmanager
+    async def slot(self, model_id: str, prompt: Hashable) -> AsyncGenerator[None, None]:
+        """
+        Wait for a slot to call `model_id` on behalf of `prompt`.
+
+        :param model_id: The model to be called.
+        :param prompt: Key of the prompt the call belongs to.
+        """
+        waiter = _Waiter(model_id, asyncio.get_running_loop().create_future())
+        self._waiting.setdefault(prompt, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(model_id)
+            else:
+                self._remove(prompt, waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(model_id)
+
+    def _has_capacity(self, model_id: str) -> bool:
+        return (
+            self.per_model_concurrency is None
+            or self._running_per_model[model_id] < self.per_model_concurrency
+        )
+
+    def _dispatch(self) -> None:
+        granted = True
+        while granted and self.running < self.max_concurrency:
+            granted = False
+            for prompt in list(self._waiting):
+                queue = self._waiting[prompt]
+                # Drop waiters cancelled before their task could remove them
+                for cancelled in [w for w in queue if w.future.done()]:
+                    queue.remove(cancelled)
+                if not queue:
+                    del self._waiting[prompt]
+                    continue
+                waiter = next(
+                    (w for w in queue if self._has_capacity(w.model_id)), None
+                )
+                if waiter is None:
+                    continue
+                queue.remove(waiter)
+                if queue:
+                    self._waiting.move_to_end(prompt)
+                else:
+                    del self._waiting[prompt]
+                self.running += 1
+                self._running_per_model[waiter.model_id] += 1
+                waiter.future.set_result(None)
+                granted = True
+                break
+
+    def _release(self, model_id: str) -> None:
+        self.running -= 1
+        self._running_per_model[model_id] -= 1
+        self._dispatch()
+
+    def _remove(self, prompt: Hashable, waiter: _Waiter) -> None:
+        queue = self._waiting.get(prompt)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._waiting[prompt]
+
+
+class _ScheduledProvider:
+    """Provider proxy sending every chat completion through a FairScheduler."""
+
+    def __init__(
+        self,
+        provider: AsyncOpenRouterProvider,
+        scheduler: FairScheduler,
+        prompt: Hashable,
+    ) -> None:
+        self._provider = provider
+        self._scheduler = scheduler
+        self._prompt = prompt
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
+
+    async def send_chat_completion(self, payload: Any, **kwargs: Any) -> dict:
+        async with self._scheduler.slot(payload["model"], self._prompt):
+            return await self._provider.send_chat_completion(payload, **kwargs)
+
+
+async def run_consensus_batch(  # noqa: PLR0913
+    provider: AsyncOpenRouterProvider,
+    consensus_config: ConsensusConfig,
+    conversations: Iterable[list[Message]],
+    *,
+    max_concurrency: int = 16,
+    per_model_concurrency: int | None = None,
+    max_active_conversations: int | None = None,
+    trace_sink: TraceWriter | None = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Run the consensus loop over many conversations.
+
+    All model and aggregator calls of all conversations go through a single
+    FairScheduler. Conversations are started lazily, at most
+    `max_active_conversations` at a time, so large inputs are not loaded
+    into memory up front. A failing conversation is reported in its result
+    and does not stop the batch.
+
+    :param provider: An instance of an AsyncOpenRouterProvider.
+    :param consensus_config: An instance of ConsensusConfig.
+    :param conversations: The initial conversations, one per prompt.
+    :param max_concurrency: Maximum number of concurrent model calls.
+    :param per_model_concurrency: Maximum concurrent calls per model id.
+    :param max_active_conversations: Maximum number of conversations in
+        progress; defaults to `4 * max_concurrency`.
+    :param trace_sink: Optional TraceWriter receiving every run's trace.
+    :return: An async iterator of BatchResult, in completion order.
+    """
+    scheduler = FairScheduler(max_concurrency, per_model_concurrency)
+    max_active = max_active_conversations or 4 * max_concurrency
+    pending_conversations = enumerate(conversations)
+
+    async def run(index: int, conversation: list[Message]) -> BatchResult:
+        scheduled = _ScheduledProvider(provider, scheduler, index)
+        try:
+            response = await run_consensus(
+                cast("AsyncOpenRouterProvider", scheduled),
+                consensus_config,
+                conversation,
+                trace_sink,
+            )
+        except Exception as e:
+            logger.exception("consensus run failed", index=index)
+            return BatchResult(index, error=str(e))
+        return BatchResult(index, aggregated_response=response)
+
+    active: set[asyncio.Task[BatchResult]] = set()
+    try:
+        while True:
+            for index, conversation in itertools.islice(
+                pending_conversations, max_active - len(active)
+            ):
+                active.add(asyncio.create_task(run(index, conversation)))
+            if not active:
+                return
+            done, active = await asyncio.wait(
+                active, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in active:
+            task.cancel()
+        await asyncio.gather(*active, return_exceptions=True)
@@ -0,0 +1,116 @@
+import re
+
+from flare_ai_consensus.utils.token_utils import estimate_tokens, truncate_to_tokens
+
+# Conversational filler that carries no content for the aggregator
+_BOILERPLATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE | re.MULTILINE)
+    for p in (
+        r"^\s*(sure|certainly|of course|absolutely|great question)[!,.].*?(\n|$)",
+        r"^\s*(here is|here's|below is) (a|an|the|my) [^\n]{0,80}:\s*(\n|$)",
+        r"^\s*(i hope (this|that) helps|let me know if|feel free to)[^\n]*(\n|$)",
+        r"^\s*([-*_])\1{2,}\s*(\n|$)",
+    )
+]
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SENTENCE_SPLIT = re.compile(r"((?<=[.!?])\s+|\n+)")
+_CODE_FENCE = re.compile(r"(```.*?(?:```|$))", re.DOTALL)
+
+
+def trim_boilerplate(text: str) -> str:
+    """
+    Remove conversational filler, horizontal rules and excess blank lines.
+
+    :param text: A model response.
+    :return: The response without boilerplate.
+    """
+    for pattern in _BOILERPLATE_PATTERNS:
+        text = pattern.sub("", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def dedupe_sentences(text: str) -> str:
+    """
+    Drop sentences that repeat an earlier sentence of the same response.
+
+    The separators between the kept sentences are preserved, so paragraphs
+    and lists keep their layout; fenced code blocks are left untouched.
+
+    :param text: A model response.
+    :return: The response with each sentence kept once, in original order.
+    """
+    seen: set[str] = set()
+    segments = _CODE_FENCE.split(text)
+    for i in range(0, len(segments), 2):
+        segments[i] = _dedupe_prose(segments[i], seen)
+    return "".join(segments).strip()
+
+
+def _dedupe_prose(text: str, seen: set[str]) -> str:
+    """Drop sentences of `text` already in `seen`, keeping the separators."""
+    parts = _SENTENCE_SPLIT.split(text)
+    kept: list[str] = []
+    separator = ""
+    for i in range(0, len(parts), 2):
+        sentence = parts[i]
+        following = parts[i + 1] if i + 1 < len(parts) else ""
+        key = " ".join(sentence.lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            kept.append(separator + sentence)
+            separator = following
+        else:
+            # Keep the line break of a dropped sentence ending a line
+            separator = max(separator, following, key=lambda s: s.count("\n"))
+    return "".join(kept) + separator
+
+
+def _fair_shares(sizes: list[int], budget: int) -> list[int]:
+    """Split `budget` so small items keep their size and large ones share the rest."""
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for position, i in enumerate(order):
+        share = remaining // (len(sizes) - position)
+        shares[i] = min(sizes[i], share)
+        remaining -= shares[i]
+    return shares
+
+
+def compact_responses(
+    responses: dict[str, str], budget: int, model_id: str | None = None
+) -> dict[str, str]:
+    """
+    Shrink responses until their estimated total fits in `budget` tokens.
+
+    Compaction stops at the first step that fits: responses are returned
+    unchanged, then with boilerplate and repeated sentences removed, and
+    finally truncated so that short responses stay whole and long ones share
+    the remaining budget.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :param budget: Token budget for all responses together.
+    :param model_id: The model whose tokenizer is approximated.
+    :return: The (possibly) compacted responses.
+    :raises ValueError: If `budget` is not positive.
+    """
+    if budget <= 0:
+        msg = f"Response budget must be positive, got {budget}"
+        raise ValueError(msg)
+
+    def total(texts: dict[str, str]) -> int:
+        return sum(estimate_tokens(t, model_id) for t in texts.values())
+
+    if total(responses) <= budget:
+        return responses
+    responses = {
+        k: dedupe_sentences(trim_boilerplate(text)) for k, text in responses.items()
+    }
+    if total(responses) <= budget:
+        return responses
+    sizes = [estimate_tokens(t, model_id) for t in responses.values()]
+    shares = _fair_shares(sizes, budget)
+    return {
+        k: truncate_to_tokens(text, share, model_id)
+        for (k, text), share in zip(responses.items(), shares, strict=True)
+    }
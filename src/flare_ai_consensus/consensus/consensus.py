@@ -1,64 +1,197 @@
 import asyncio
+import math
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 
 import structlog
 
-from flare_ai_consensus.consensus.aggregator import async_centralized_llm_aggregator
+from flare_ai_consensus.consensus.aggregator import aggregate_responses
+from flare_ai_consensus.consensus.hedging import hedged_call
+from flare_ai_consensus.consensus.similarity import (
+    mean_pairwise_similarity,
+    text_similarity,
+)
 from flare_ai_consensus.router import AsyncOpenRouterProvider, ChatRequest
 from flare_ai_consensus.settings import ConsensusConfig, Message, ModelConfig
-from flare_ai_consensus.utils import parse_chat_response
+from flare_ai_consensus.utils import TraceWriter, parse_chat_response
 
 logger = structlog.get_logger(__name__)
 
 
-async def run_consensus(
+class QuorumNotReachedError(Exception):
+    """Raised when no model in a round produced a response."""
+
+
+@dataclass
+class RoundResult:
+    """
+    Outcome of a single round of model requests.
+
+    Attributes:
+        responses: Response text per model id, for models that answered
+        dropped: Model ids cancelled once the quorum or deadline was reached
+        failed: Error message per model id, for models whose request failed
+    """
+
+    responses: dict[str, str]
+    dropped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _has_converged(
+    consensus_config: ConsensusConfig,
+    responses: dict[str, str],
+    previous_aggregate: str | None,
+    aggregated_response: str,
+) -> tuple[bool, dict[str, float]]:
+    """
+    Check whether a round has converged.
+
+    A round has converged when the model responses agree with each other and,
+    after the first round, the aggregate barely changed from the previous one.
+    Agreement is only scored when at least two models answered; with a single
+    response the round can only converge on stability.
+
+    :param consensus_config: An instance of ConsensusConfig.
+    :param responses: The responses of the round.
+    :param previous_aggregate: The aggregate of the previous round (or None).
+    :param aggregated_response: The aggregate of this round.
+    :return: Whether the round converged, and the similarity scores.
+    """
+    scores: dict[str, float] = {}
+    if len(responses) >= 2:  # noqa: PLR2004
+        scores["agreement"] = mean_pairwise_similarity(list(responses.values()))
+    if previous_aggregate is not None:
+        scores["stability"] = text_similarity(previous_aggregate, aggregated_response)
+    threshold = consensus_config.convergence_threshold
+    converged = (
+        threshold is not None
+        and bool(scores)
+        and all(s >= threshold for s in scores.values())
+    )
+    return converged, scores
+
+
+@dataclass(frozen=True)
+class ConsensusUpdate:
+    """
+    The aggregate of one completed consensus round.
+
+    Attributes:
+        iteration: Round number, 0 for the initial round
+        aggregate: The aggregated response of the round
+        responses: Response text per model id
+        dropped: Model ids cancelled once the quorum or deadline was reached
+        failed: Error message per model id, for models whose request failed
+        converged: Whether the responses converged, ending the loop
+    """
+
+    iteration: int
+    aggregate: str
+    responses: dict[str, str]
+    dropped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    converged: bool = False
+
+
+async def run_consensus_progressive(
     provider: AsyncOpenRouterProvider,
     consensus_config: ConsensusConfig,
     initial_conversation: list[Message],
-) -> str:
+    trace_sink: TraceWriter | None = None,
+) -> AsyncIterator[ConsensusUpdate]:
     """
-    Asynchronously runs the consensus learning loop.
+    Run the consensus learning loop, yielding each round's aggregate.
+
+    The first update arrives after the initial round, so callers can show a
+    usable answer while the improvement rounds refine it. If
+    `consensus_config.convergence_threshold` is set, the loop stops early
+    once the models agree and the aggregate is stable between rounds.
 
     :param provider: An instance of an AsyncOpenRouterProvider.
     :param consensus_config: An instance of ConsensusConfig.
     :param initial_conversation: the input user prompt with system instructions.
-
-    Returns: aggregated response (str)
-    All responses are stored in response_data and can be returned for future use.
+    :param trace_sink: Optional TraceWriter that receives response_data once
+        the loop completes, fails or is abandoned.
+    :return: An async iterator of ConsensusUpdate, one per round.
     """
     response_data = {}
     response_data["initial_conversation"] = initial_conversation
 
-    # Step 1: Initial round.
-    responses = await send_round(
-        provider, consensus_config, response_data["initial_conversation"]
-    )
-    aggregated_response = await async_centralized_llm_aggregator(
-        provider, consensus_config.aggregator_config, responses
-    )
-    logger.info(
-        "initial response aggregation complete", aggregated_response=aggregated_response
-    )
+    try:
+        aggregated_response = None
+        for i in range(consensus_config.iterations + 1):
+            previous_aggregate = aggregated_response
+            result = await send_round(
+                provider, consensus_config, initial_conversation, aggregated_response
+            )
+            aggregated_response = await aggregate_responses(
+                provider, consensus_config.aggregator_config, result.responses
+            )
+            logger.info(
+                "responses aggregated",
+                iteration=i,
+                aggregated_response=aggregated_response,
+            )
 
-    response_data["iteration_0"] = responses
-    response_data["aggregate_0"] = aggregated_response
+            response_data[f"iteration_{i}"] = result.responses
+            response_data[f"dropped_{i}"] = result.dropped
+            response_data[f"failed_{i}"] = result.failed
+            response_data[f"aggregate_{i}"] = aggregated_response
+            converged, response_data[f"similarity_{i}"] = _has_converged(
+                consensus_config,
+                result.responses,
+                previous_aggregate,
+                aggregated_response,
+            )
+            if converged and i < consensus_config.iterations:
+                logger.info("consensus converged", iteration=i)
+                response_data["converged_at"] = i
 
-    # Step 2: Improvement rounds.
-    for i in range(consensus_config.iterations):
-        responses = await send_round(
-            provider, consensus_config, initial_conversation, aggregated_response
-        )
-        aggregated_response = await async_centralized_llm_aggregator(
-            provider, consensus_config.aggregator_config, responses
-        )
-        logger.info(
-            "responses aggregated",
-            iteration=i + 1,
-            aggregated_response=aggregated_response,
-        )
+            yield ConsensusUpdate(
+                iteration=i,
+                aggregate=aggregated_response,
+                responses=result.responses,
+                dropped=result.dropped,
+                failed=result.failed,
+                converged=converged,
+            )
+            if converged:
+                break
 
-        response_data[f"iteration_{i + 1}"] = responses
-        response_data[f"aggregate_{i + 1}"] = aggregated_response
+        response_data["final"] = aggregated_response
+    except Exception as e:
+        response_data["error"] = str(e)
+        raise
+    finally:
+        # Failed and abandoned runs are traced too, up to the last round
+        if trace_sink is not None:
+            trace_sink.submit(response_data)
 
+
+async def run_consensus(
+    provider: AsyncOpenRouterProvider,
+    consensus_config: ConsensusConfig,
+    initial_conversation: list[Message],
+    trace_sink: TraceWriter | None = None,
+) -> str:
+    """
+    Asynchronously runs the consensus learning loop.
+
+    :param provider: An instance of an AsyncOpenRouterProvider.
+    :param consensus_config: An instance of ConsensusConfig.
+    :param initial_conversation: the input user prompt with system instructions.
+    :param trace_sink: Optional TraceWriter that receives response_data.
+
+    Returns: aggregated response (str)
+    All responses are stored in response_data, which is submitted to
+    `trace_sink` when one is given.
+    """
+    aggregated_response = ""
+    async for update in run_consensus_progressive(
+        provider, consensus_config, initial_conversation, trace_sink
+    ):
+        aggregated_response = update.aggregate
     return aggregated_response
 
 
@@ -120,16 +253,66 @@ async def _get_response_for_model(
         )
         logger.info("sending improvement prompt", model_id=model.model_id)
 
+    hedging = consensus_config.hedging
+    delay = None
+    if hedging is not None:
+        delay = provider.latency.percentile(
+            model.model_id, hedging.percentile, hedging.min_samples
+        )
+    if hedging is None or delay is None:
+        text = await _send_to_model(provider, model, conversation)
+    else:
+        # Race a backup request against the primary once it is slower than
+        # the model's usual tail latency.
+        backup = hedging.fallbacks.get(model.model_id, model)
+        text = await hedged_call(
+            lambda: _send_to_model(provider, model, conversation),
+            lambda: _send_to_model(provider, backup, conversation),
+            delay,
+        )
+    logger.info("new response", model_id=model.model_id, response=text)
+    return model.model_id, text
+
+
+async def _send_to_model(
+    provider: AsyncOpenRouterProvider,
+    model: ModelConfig,
+    conversation: list[Message],
+) -> str:
+    """
+    Send a conversation to a model and return the response text.
+
+    :param provider: An instance of an asynchronous OpenRouter provider.
+    :param model: A ModelConfig instance.
+    :param conversation: The messages to send.
+    :return: The response text.
+    """
     payload: ChatRequest = {
         "model": model.model_id,
         "messages": conversation,
         "max_tokens": model.max_tokens,
         "temperature": model.temperature,
     }
-    response = await provider.send_chat_completion(payload)
-    text = parse_chat_response(response)
-    logger.info("new response", model_id=model.model_id, response=text)
-    return model.model_id, text
+    response = await provider.send_chat_completion(
+        payload, cache=model.cacheable or None
+    )
+    return parse_chat_response(response)
+
+
+def _quorum_size(quorum: float | None, n_models: int) -> int:
+    """
+    Return how many responses satisfy the quorum.
+
+    :param quorum: None for all models, an int k for k-of-n, or a float in
+        (0, 1] for a fraction of the models.
+    :param n_models: Number of models in the round.
+    :return: The number of responses to wait for.
+    """
+    if quorum is None:
+        return n_models
+    if isinstance(quorum, float):
+        return max(1, min(n_models, math.ceil(quorum * n_models)))
+    return max(1, min(n_models, quorum))
 
 
 async def send_round(
@@ -137,22 +320,89 @@ async def send_round(
     consensus_config: ConsensusConfig,
     initial_conversation: list[Message],
     aggregated_response: str | None = None,
-) -> dict:
+) -> RoundResult:
     """
     Asynchronously sends a round of chat completion requests for all models.
 
+    The round returns as soon as `consensus_config.quorum` models have
+    answered or `consensus_config.round_deadline` has passed, whichever
+    comes first; the remaining requests are cancelled and reported as
+    dropped. A failing model is reported in `failed` instead of failing the
+    whole round.
+
     :param provider: An instance of an asynchronous OpenRouter provider.
     :param consensus_config: An instance of ConsensusConfig.
     :param initial_conversation: the input user prompt with system instructions.
     :param aggregated_response: The aggregated consensus response from the
         previous round (or None).
-    :return: A dictionary mapping model IDs to their response texts.
+    :return: A RoundResult mapping model IDs to their response texts.
+    :raises QuorumNotReachedError: If no model produced a response.
     """
-    tasks = [
-        _get_response_for_model(
-            provider, consensus_config, model, initial_conversation, aggregated_response
+    # Skip models whose circuit breaker is open, keeping at least min_quorum.
+    models = provider.health.select(
+        consensus_config.models, consensus_config.min_quorum
+    )
+    if len(models) < len(consensus_config.models):
+        selected = {m.model_id for m in models}
+        logger.warning(
+            "skipping unhealthy models",
+            skipped=[
+                m.model_id
+                for m in consensus_config.models
+                if m.model_id not in selected
+            ],
         )
-        for model in consensus_config.models
-    ]
-    results = await asyncio.gather(*tasks)
-    return dict(results)
+
+    tasks: dict[asyncio.Task[tuple[str | None, str]], str] = {
+        asyncio.create_task(
+            _get_response_for_model(
+                provider,
+                consensus_config,
+                model,
+                initial_conversation,
+                aggregated_response,
+            )
+        ): model.model_id
+        for model in models
+    }
+    needed = _quorum_size(consensus_config.quorum, len(tasks))
+    loop = asyncio.get_running_loop()
+    deadline = (
+        loop.time() + consensus_config.round_deadline
+        if consensus_config.round_deadline is not None
+        else None
+    )
+
+    result = RoundResult(responses={})
+    pending = set(tasks)
+    try:
+        while pending and len(result.responses) < needed:
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                model_id = tasks[task]
+                error = task.exception()
+                if error is not None:
+                    logger.warning(
+                        "model request failed", model_id=model_id, error=error
+                    )
+                    result.failed[model_id] = str(error)
+                else:
+                    result.responses[model_id] = task.result()[1]
+    finally:
+        # Cancel stragglers and wait for them so no request outlives the round.
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    result.dropped = [tasks[task] for task in pending]
+    if result.dropped:
+        logger.info("dropped slow models", dropped=result.dropped)
+    if not result.responses:
+        msg = f"No model responded in the round (failed: {result.failed})"
+        raise QuorumNotReachedError(msg)
+    return result
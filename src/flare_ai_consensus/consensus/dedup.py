@@ -0,0 +1,119 @@
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+# Characters per shingle
+SHINGLE_SIZE = 5
+
+# Hash functions per MinHash signature
+NUM_PERMUTATIONS = 128
+
+# Mersenne prime modulus of the universal hash family
+_PRIME = (1 << 31) - 1
+
+
+@dataclass(frozen=True)
+class ResponseCluster:
+    """
+    A group of near-identical responses.
+
+    Attributes:
+        representative: Model id whose response stands for the cluster
+        text: The representative response text
+        members: Model ids of every response in the cluster
+    """
+
+    representative: str
+    text: str
+    members: tuple[str, ...]
+
+    @property
+    def weight(self) -> int:
+        return len(self.members)
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    normalized = " ".join(text.lower().split())
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {
+            normalized[i : i + SHINGLE_SIZE]
+            for i in range(len(normalized) - SHINGLE_SIZE + 1)
+        }
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+def minhash_signatures(texts: list[str], seed: int = 0) -> np.ndarray:
+    """
+    Compute MinHash signatures of the character shingles of texts.
+
+    :param texts: The texts to sign.
+    :param seed: Seed of the hash family; signatures are only comparable when
+        computed with the same seed.
+    :return: An array of shape (len(texts), NUM_PERMUTATIONS).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64)
+    signatures = np.empty((len(texts), NUM_PERMUTATIONS), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = _shingle_hashes(text)[np.newaxis, :]
+        signatures[row] = ((a * hashes + b) % _PRIME).min(axis=1)
+    return signatures
+
+
+def estimated_jaccard(texts: list[str]) -> np.ndarray:
+    """
+    Estimate the pairwise Jaccard similarity of the shingle sets of texts.
+
+    :param texts: The texts to compare.
+    :return: A symmetric (n, n) matrix of similarities in [0, 1].
+    """
+    signatures = minhash_signatures(texts)
+    return (signatures[:, np.newaxis, :] == signatures[np.newaxis, :, :]).mean(axis=2)
+
+
+def cluster_near_duplicates(
+    responses: dict[str, str], threshold: float = 0.8
+) -> list[ResponseCluster]:
+    """
+    Group responses whose estimated Jaccard similarity reaches `threshold`.
+
+    Similarity is treated as transitive (single linkage). The first response
+    of each cluster, in the input order, is its representative.
+
+    :param responses: A dictionary mapping model IDs to their response texts.
+    :param threshold: Minimum similarity for two responses to be merged.
+    :return: The clusters, ordered by their representative's input position.
+    """
+    model_ids = list(responses)
+    if not model_ids:
+        return []
+    similar = estimated_jaccard(list(responses.values())) >= threshold
+
+    parent = list(range(len(model_ids)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(np.triu(similar, k=1)), strict=True):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    members: dict[int, list[str]] = {}
+    for i, model_id in enumerate(model_ids):
+        members.setdefault(find(i), []).append(model_id)
+    return [
+        ResponseCluster(model_ids[root], responses[model_ids[root]], tuple(group))
+        for root, group in members.items()
+    ]
@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+async def hedged_call[T](
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    delay: float,
+) -> T:
+    """
+    Run `primary`, and if it has not finished after `delay` seconds also run
+    `backup`; return whichever succeeds first and cancel the other.
+
+    If the primary fails before the hedge fires, its error is raised
+    directly. Once both are running, an error from one is ignored as long as
+    the other can still succeed.
+
+    :param primary: Zero-argument coroutine function for the primary call.
+    :param backup: Zero-argument coroutine function for the backup call.
+    :param delay: Seconds to wait for the primary before hedging.
+    :return: The result of the first successful call.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    tasks: set[asyncio.Future[T]] = {primary_task}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return primary_task.result()
+
+        logger.info("hedging request", delay=round(delay, 3))
+        tasks.add(asyncio.ensure_future(backup()))
+        errors: list[BaseException] = []
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+                errors.append(error)
+        raise errors[0]
+    finally:
+        # Wait for the losing call to unwind so its connection is released.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,224 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+import structlog
+
+from flare_ai_consensus.consensus.consensus import run_consensus_progressive
+from flare_ai_consensus.router import AsyncOpenRouterProvider
+from flare_ai_consensus.settings import ConsensusConfig, Message
+from flare_ai_consensus.utils import TraceWriter
+
+logger = structlog.get_logger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = frozenset(
+    {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+)
+
+
+@dataclass
+class ConsensusJob:
+    """
+    A consensus run submitted to a ConsensusJobQueue.
+
+    Attributes:
+        job_id: Unique identifier of the job
+        conversation: The initial conversation
+        status: Current state of the job
+        iteration: Last completed round, or None before the first round
+        aggregate: Aggregate of the last completed round
+        error: Error message if the job failed
+    """
+
+    conversation: list[Message]
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    iteration: int | None = None
+    aggregate: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the job state for reporting."""
+        return {
+            "job_id": self.job_id,
+            "status": str(self.status),
+            "iteration": self.iteration,
+            "aggregate": self.aggregate,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ConsensusJobQueue:
+    """
+    Run consensus jobs in the background with a bounded pool of workers.
+
+    Submitting only enqueues the job; `workers` tasks run queued jobs one at
+    a time each. Finished jobs are kept for `ttl` seconds so that their
+    status and result can be polled, then evicted.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        provider: AsyncOpenRouterProvider,
+        consensus_config: ConsensusConfig,
+        *,
+        workers: int = 2,
+        max_pending: int = 100,
+        ttl: float = 3600,
+        trace_sink: TraceWriter | None = None,
+    ) -> None:
+        """
+        :param provider: An instance of an AsyncOpenRouterProvider.
+        :param consensus_config: An instance of ConsensusConfig.
+        :param workers: Maximum number of jobs running at once.
+        :param max_pending: Maximum number of queued jobs.
+        :param ttl: Seconds a finished job is kept.
+        :param trace_sink: Optional TraceWriter receiving every run's trace.
+        """
+        self.provider = provider
+        self.consensus_config = consensus_config
+        self.workers = workers
+        self.ttl = ttl
+        self.trace_sink = trace_sink
+        self.jobs: dict[str, ConsensusJob] = {}
+        self._queue: asyncio.Queue[ConsensusJob] = asyncio.Queue(max_pending)
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def _ensure_started(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"consensus-worker-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def close(self) -> None:
+        """Stop the workers, cancelling running and queued jobs."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self.jobs.values():
+            if not job.finished:
+                self._finish(job, JobStatus.CANCELLED)
+
+    def submit(self, conversation: list[Message]) -> ConsensusJob:
+        """
+        Queue a consensus run.
+
+        :param conversation: The initial conversation.
+        :return: The queued job.
+        :raises JobQueueFullError: If `max_pending` jobs are already queued.
+        """
+        self._ensure_started()
+        self._evict_expired()
+        job = ConsensusJob(conversation)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            msg = f"{self._queue.maxsize} consensus jobs are already queued"
+            raise JobQueueFullError(msg) from e
+        self.jobs[job.job_id] = job
+        logger.info("consensus job queued", job_id=job.job_id)
+        return job
+
+    def get(self, job_id: str) -> ConsensusJob | None:
+        """Return the job with `job_id`, or None if unknown or evicted."""
+        self._evict_expired()
+        return self.jobs.get(job_id)
+
+    async def cancel(self, job_id: str) -> ConsensusJob | None:
+        """
+        Cancel a queued or running job, waiting until a running job has stopped.
+
+        :param job_id: The job to cancel.
+        :return: The job, or None if unknown or evicted.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.task is not None:
+            job.task.cancel()
+            await asyncio.wait([job.task])
+        else:
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.finished:
+                continue
+            job.status = JobStatus.RUNNING
+            job.task = asyncio.create_task(self._run(job))
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if current is not None and current.cancelling():
+                    # The worker itself is being stopped.
+                    raise
+            finally:
+                job.task = None
+                # A task cancelled before its first step never ran _run
+                if not job.finished:
+                    self._finish(job, JobStatus.CANCELLED)
+
+    async def _run(self, job: ConsensusJob) -> None:
+        try:
+            async for update in run_consensus_progressive(
+                self.provider,
+                self.consensus_config,
+                job.conversation,
+                self.trace_sink,
+            ):
+                job.iteration = update.iteration
+                job.aggregate = update.aggregate
+        except asyncio.CancelledError:
+            self._finish(job, JobStatus.CANCELLED)
+            raise
+        except Exception as e:
+            logger.exception("consensus job failed", job_id=job.job_id)
+            job.error = str(e)
+            self._finish(job, JobStatus.FAILED)
+        else:
+            self._finish(job, JobStatus.SUCCEEDED)
+
+    def _finish(self, job: ConsensusJob, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        logger.info("consensus job finished", job_id=job.job_id, status=str(status))
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
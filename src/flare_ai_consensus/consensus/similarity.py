@@ -0,0 +1,71 @@
+import re
+import zlib
+from collections.abc import Sequence
+from itertools import pairwise
+
+import numpy as np
+
+# Dimension of the hashed feature space
+N_FEATURES = 1 << 12
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _features(text: str) -> list[int]:
+    """Hash the unigrams and bigrams of `text` into feature indices."""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in pairwise(tokens)]
+    return [zlib.crc32(gram.encode("utf-8")) % N_FEATURES for gram in grams]
+
+
+def hashing_vectors(texts: Sequence[str]) -> np.ndarray:
+    """
+    Embed texts as L2-normalised hashed bag-of-words vectors.
+
+    Token counts are hashed into `N_FEATURES` buckets with CRC32, so the
+    vectors are stable across processes and need no fitted vocabulary.
+
+    :param texts: The texts to embed.
+    :return: An array of shape (len(texts), N_FEATURES).
+    """
+    vectors = np.zeros((len(texts), N_FEATURES))
+    for row, text in enumerate(texts):
+        np.add.at(vectors[row], _features(text), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def similarity_matrix(texts: Sequence[str]) -> np.ndarray:
+    """
+    Compute the pairwise cosine similarity of texts.
+
+    :param texts: The texts to compare.
+    :return: A symmetric (n, n) matrix of similarities in [0, 1].
+    """
+    vectors = hashing_vectors(texts)
+    return vectors @ vectors.T
+
+
+def text_similarity(a: str, b: str) -> float:
+    """
+    Compute the cosine similarity of two texts.
+
+    :param a: The first text.
+    :param b: The second text.
+    :return: The similarity in [0, 1].
+    """
+    return float(similarity_matrix([a, b])[0, 1])
+
+
+def mean_pairwise_similarity(texts: Sequence[str]) -> float:
+    """
+    Compute the mean cosine similarity over all pairs of texts.
+
+    :param texts: The texts to compare.
+    :return: The mean similarity in [0, 1], or 1.0 for fewer than two texts.
+    """
+    n = len(texts)
+    if n <= 1:
+        return 1.0
+    matrix = similarity_matrix(texts)
+    return float(matrix[np.triu_indices(n, k=1)].mean())
@@ -1,32 +1,127 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 import structlog
 import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from flare_ai_consensus.api import ChatRouter
-from flare_ai_consensus.router import AsyncOpenRouterProvider
+from flare_ai_consensus.api import ChatRouter, ConsensusRouter, HealthRouter
+from flare_ai_consensus.consensus import ConsensusJobQueue
+from flare_ai_consensus.router import (
+    AsyncOpenRouterProvider,
+    AsyncRateLimiter,
+    MemoryCache,
+    RateLimit,
+    ResponseCache,
+    RetryPolicy,
+    SQLiteCache,
+    TieredCache,
+)
 from flare_ai_consensus.settings import settings
-from flare_ai_consensus.utils import load_json
+from flare_ai_consensus.utils import TraceWriter, load_json
 
 logger = structlog.get_logger(__name__)
 
 
+def create_response_cache() -> ResponseCache:
+    """
+    Create the response cache from settings.
+
+    Returns an in-memory LRU, backed by a SQLite tier when
+    `response_cache_path` is set.
+    """
+    memory = MemoryCache(
+        max_entries=settings.response_cache_max_entries,
+        max_bytes=settings.response_cache_max_bytes,
+        ttl=settings.response_cache_ttl,
+    )
+    if settings.response_cache_path is None:
+        return memory
+    disk = SQLiteCache(settings.response_cache_path, ttl=settings.response_cache_ttl)
+    return TieredCache(memory, disk)
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application instance.
 
     This function:
-      1. Creates a new FastAPI instance with optional CORS middleware.
-      2. Loads configuration.
-      3. Sets up the OpenRouter client.
+      1. Loads configuration.
+      2. Sets up the OpenRouter client, the optional trace writer and the
+         consensus job queue.
+      3. Creates a new FastAPI instance with optional CORS middleware.
       4. Initializes a ChatRouter that wraps the RAG pipeline.
       5. Registers the chat endpoint under the /chat prefix.
+      6. Registers the model health endpoint under the /health prefix.
+      7. Registers the consensus and consensus job endpoints under the
+         /consensus prefix.
 
     Returns:
         FastAPI: The configured FastAPI application instance.
     """
+    # Load input configuration.
+    config_json = load_json(settings.input_path / "input.json")
+    settings.load_consensus_config(config_json)
+
+    # Initialize the OpenRouter provider.
+    cache = create_response_cache()
+    provider = AsyncOpenRouterProvider(
+        api_key=settings.open_router_api_key,
+        base_url=settings.open_router_base_url,
+        retry_policy=RetryPolicy(deadline=settings.open_router_retry_deadline),
+        rate_limiter=AsyncRateLimiter(
+            per_model=RateLimit(
+                requests_per_second=settings.model_requests_per_second,
+                tokens_per_minute=settings.model_tokens_per_minute,
+            ),
+            per_key=RateLimit(
+                requests_per_second=settings.key_requests_per_second,
+                tokens_per_minute=settings.key_tokens_per_minute,
+            ),
+        ),
+        cache=cache,
+    )
+
+    # Store the trace of every consensus run when a trace path is set.
+    trace_sink = (
+        TraceWriter(settings.consensus_trace_path)
+        if settings.consensus_trace_path is not None
+        else None
+    )
+
+    # Run long consensus jobs in the background, off the request path.
+    job_queue = (
+        ConsensusJobQueue(
+            provider,
+            settings.consensus_config,
+            workers=settings.consensus_job_workers,
+            max_pending=settings.consensus_job_max_pending,
+            ttl=settings.consensus_job_ttl,
+            trace_sink=trace_sink,
+        )
+        if settings.consensus_config is not None
+        else None
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+        if trace_sink is not None:
+            await trace_sink.start()
+        yield
+        if job_queue is not None:
+            await job_queue.close()
+        if trace_sink is not None:
+            await trace_sink.close()
+        await provider.close()
+        if isinstance(cache, SQLiteCache | TieredCache):
+            cache.close()
+
     app = FastAPI(
-        title="Flare AI Consensus Learning", version="1.0", redirect_slashes=False
+        title="Flare AI Consensus Learning",
+        version="1.0",
+        redirect_slashes=False,
+        lifespan=lifespan,
     )
 
     # Optional: configure CORS middleware using settings.
@@ -38,15 +133,6 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Load input configuration.
-    config_json = load_json(settings.input_path / "input.json")
-    settings.load_consensus_config(config_json)
-
-    # Initialize the OpenRouter provider.
-    provider = AsyncOpenRouterProvider(
-        api_key=settings.open_router_api_key, base_url=settings.open_router_base_url
-    )
-
     # Create an APIRouter for chat endpoints and initialize ChatRouter.
     chat_router = ChatRouter(
         router=APIRouter(),
@@ -55,6 +141,24 @@ def create_app() -> FastAPI:
     )
     app.include_router(chat_router.router, prefix="/api/routes/chat", tags=["chat"])
 
+    # Run the consensus loop, optionally streaming each round.
+    consensus_router = ConsensusRouter(
+        router=APIRouter(),
+        provider=provider,
+        consensus_config=settings.consensus_config,
+        job_queue=job_queue,
+        trace_sink=trace_sink,
+    )
+    app.include_router(
+        consensus_router.router, prefix="/api/routes/consensus", tags=["consensus"]
+    )
+
+    # Expose per-model circuit breaker, latency and cache state.
+    health_router = HealthRouter(router=APIRouter(), provider=provider)
+    app.include_router(
+        health_router.router, prefix="/api/routes/health", tags=["health"]
+    )
+
     return app
 
 
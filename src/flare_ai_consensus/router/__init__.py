@@ -1,9 +1,25 @@
 from .base_router import ChatRequest, CompletionRequest
+from .cache import MemoryCache, ResponseCache, SQLiteCache, TieredCache
+from .health import BreakerConfig, CircuitState, HealthRegistry
 from .openrouter import AsyncOpenRouterProvider, OpenRouterProvider
+from .rate_limit import AsyncRateLimiter, RateLimit
+from .retry import RetryPolicy, StatusPolicy, UpstreamStatusError
 
 __all__ = [
     "AsyncOpenRouterProvider",
+    "AsyncRateLimiter",
+    "BreakerConfig",
     "ChatRequest",
+    "CircuitState",
     "CompletionRequest",
+    "HealthRegistry",
+    "MemoryCache",
     "OpenRouterProvider",
+    "RateLimit",
+    "ResponseCache",
+    "RetryPolicy",
+    "SQLiteCache",
+    "StatusPolicy",
+    "TieredCache",
+    "UpstreamStatusError",
 ]
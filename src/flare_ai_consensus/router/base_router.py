@@ -1,8 +1,19 @@
+import json
+from collections.abc import AsyncIterator
 from typing import Any, TypedDict
 
 import httpx
 import requests
 
+from flare_ai_consensus.router.rate_limit import (
+    AsyncRateLimiter,
+    estimate_request_tokens,
+)
+from flare_ai_consensus.router.retry import (
+    RetryPolicy,
+    UpstreamStatusError,
+    retry_call,
+)
 from flare_ai_consensus.settings import Message
 
 
@@ -88,18 +99,44 @@ class AsyncBaseRouter:
     common logic for API interaction.
     """
 
-    def __init__(self, base_url: str, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: AsyncRateLimiter | None = None,
+    ) -> None:
         """
         :param base_url: The base URL for the API.
         :param api_key: Optional API key for authentication.
+        :param retry_policy: Optional RetryPolicy for failed requests.
+            Defaults to RetryPolicy().
+        :param rate_limiter: Optional AsyncRateLimiter applied to every
+            model request (including retries). May be shared across providers.
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
         self.client = httpx.AsyncClient(timeout=30.0)
         self.headers = {"accept": "application/json"}
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
 
+    async def _throttle(
+        self, json_payload: dict[str, Any] | CompletionRequest | ChatRequest
+    ) -> None:
+        """
+        Wait for the rate limiter, if any, before sending a model request.
+
+        :param json_payload: The JSON payload about to be sent.
+        """
+        if self.rate_limiter is None or "model" not in json_payload:
+            return
+        await self.rate_limiter.acquire(
+            json_payload["model"], self.api_key, estimate_request_tokens(json_payload)
+        )
+
     async def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """
         Make an asynchronous GET request to the API and return the JSON response.
@@ -110,13 +147,15 @@ class AsyncBaseRouter:
         """
         params = params or {}
         url = self.base_url + endpoint
-        response = await self.client.get(url, params=params, headers=self.headers)
 
-        success_status = 200
-        if response.status_code == success_status:
-            return response.json()
-        msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        async def attempt() -> dict:
+            response = await self.client.get(url, params=params, headers=self.headers)
+            success_status = 200
+            if response.status_code == success_status:
+                return response.json()
+            raise UpstreamStatusError.from_response(response)
+
+        return await retry_call(self.retry_policy, attempt, endpoint)
 
     async def _post(
         self,
@@ -127,19 +166,80 @@ class AsyncBaseRouter:
         Make an asynchronous POST request to the API with a JSON
         payload and return the JSON response.
 
+        Failed attempts are retried according to `self.retry_policy`, and
+        every attempt waits for `self.rate_limiter`.
+
         :param endpoint: The API endpoint
             (should begin with a slash, e.g., "/completions").
         :param json_payload: The JSON payload to send.
         :return: JSON response as a dictionary.
         """
         url = self.base_url + endpoint
-        response = await self.client.post(url, headers=self.headers, json=json_payload)
 
-        success_status = 200
-        if response.status_code == success_status:
-            return response.json()
-        msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        async def attempt() -> dict:
+            await self._throttle(json_payload)
+            response = await self.client.post(
+                url, headers=self.headers, json=json_payload
+            )
+            success_status = 200
+            if response.status_code == success_status:
+                return response.json()
+            raise UpstreamStatusError.from_response(response)
+
+        return await retry_call(self.retry_policy, attempt, endpoint)
+
+    async def _post_stream(
+        self,
+        endpoint: str,
+        json_payload: dict[str, Any] | CompletionRequest | ChatRequest,
+    ) -> AsyncIterator[dict]:
+        """
+        Make an asynchronous streaming POST request and yield the parsed
+        server-sent events as they arrive.
+
+        The payload is sent with `"stream": true`; comment lines (used by
+        OpenRouter as keep-alives) are skipped and the iterator stops at the
+        `[DONE]` sentinel.  Opening the stream is retried according to
+        `self.retry_policy`; once the first chunk is yielded the stream is not
+        retried.  The underlying response is closed when the iterator is
+        exhausted, closed or cancelled.
+
+        :param endpoint: The API endpoint
+            (should begin with a slash, e.g., "/chat/completions").
+        :param json_payload: The JSON payload to send.
+        :return: An async iterator over the JSON chunks of the stream.
+        """
+        url = self.base_url + endpoint
+        stream_payload = {**json_payload, "stream": True}
+
+        async def attempt() -> httpx.Response:
+            await self._throttle(json_payload)
+            request = self.client.build_request(
+                "POST", url, headers=self.headers, json=stream_payload
+            )
+            response = await self.client.send(request, stream=True)
+            success_status = 200
+            if response.status_code != success_status:
+                await response.aread()
+                await response.aclose()
+                raise UpstreamStatusError.from_response(response)
+            return response
+
+        response = await retry_call(self.retry_policy, attempt, endpoint)
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line.removeprefix("data:").strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if "error" in chunk:
+                    msg = f"Error in stream: {chunk['error']}"
+                    raise ConnectionError(msg)
+                yield chunk
+        finally:
+            await response.aclose()
 
     async def close(self) -> None:
         """
@@ -0,0 +1,268 @@
+"""
+Response caches for chat completions.
+
+Deterministic requests (temperature 0, or prompts explicitly marked as
+cacheable) return the same answer every time, so re-sending them upstream
+only costs latency and credits. The provider looks responses up by the
+canonical request key before calling the API.
+
+Classes:
+    CacheStats: Hit, miss and eviction counters
+    ResponseCache: Base class for pluggable caches
+    MemoryCache: Bounded in-memory LRU with TTL and byte-size cap
+    SQLiteCache: On-disk cache with TTL and byte-size cap
+    TieredCache: Memory cache in front of a disk cache
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import override
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit, miss and eviction counters of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _encode(value: dict) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache(ABC):
+    """
+    Base class for response caches keyed by request hash.
+
+    Values are stored serialized, so every `get` returns a fresh copy that
+    callers are free to mutate.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> dict | None:
+        """Return the cached response for `key`, or None on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: dict) -> None:
+        """Store `value` under `key`."""
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-memory LRU cache bounded by entry count and total size in bytes.
+
+    Entries older than `ttl` seconds are treated as misses and dropped.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, max_bytes: int = 64 << 20, ttl: float = 3600
+    ) -> None:
+        """
+        :param max_entries: Maximum number of cached responses.
+        :param max_bytes: Maximum total size of the serialized responses.
+        :param ttl: Time-to-live of an entry in seconds.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return the serialized response for `key`, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return data
+
+    def set_bytes(self, key: str, data: bytes) -> None:
+        """Store a serialized response, evicting least recently used entries."""
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, data)
+        self.size += len(data)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, data = self._entries.pop(key)
+        self.size -= len(data)
+
+    @override
+    async def get(self, key: str) -> dict | None:
+        data = self.get_bytes(key)
+        return json.loads(data) if data is not None else None
+
+    @override
+    async def set(self, key: str, value: dict) -> None:
+        self.set_bytes(key, _encode(value))
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk cache in a SQLite database, bounded by total size in bytes.
+
+    Database access runs in a worker thread so the event loop is not blocked.
+    When the size cap is exceeded, least recently accessed entries are evicted.
+    """
+
+    def __init__(
+        self, path: Path, max_bytes: int = 512 << 20, ttl: float = 86400
+    ) -> None:
+        """
+        :param path: Path of the SQLite database file.
+        :param max_bytes: Maximum total size of the serialized responses.
+        :param ttl: Time-to-live of an entry in seconds.
+        """
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses(accessed_at)"
+            )
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return the serialized response for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        self.stats.hits += 1
+        return row[0]
+
+    def set_bytes(self, key: str, data: bytes) -> None:
+        """Store a serialized response, evicting entries over the size cap."""
+        if len(data) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            if total > self.max_bytes:
+                self._evict(total - self.max_bytes)
+
+    def _evict(self, excess: int) -> None:
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        victims = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats.evictions += len(victims)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @override
+    async def get(self, key: str) -> dict | None:
+        data = await asyncio.to_thread(self.get_bytes, key)
+        return json.loads(data) if data is not None else None
+
+    @override
+    async def set(self, key: str, value: dict) -> None:
+        await asyncio.to_thread(self.set_bytes, key, _encode(value))
+
+
+class TieredCache(ResponseCache):
+    """
+    A memory cache in front of a disk cache.
+
+    Disk hits are promoted to memory; writes go to both tiers. `stats`
+    counts lookups of the combined cache.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: SQLiteCache) -> None:
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    @override
+    async def get(self, key: str) -> dict | None:
+        data = self.memory.get_bytes(key)
+        if data is None:
+            data = await asyncio.to_thread(self.disk.get_bytes, key)
+            if data is not None:
+                self.memory.set_bytes(key, data)
+        if data is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(data)
+
+    @override
+    async def set(self, key: str, value: dict) -> None:
+        data = _encode(value)
+        self.memory.set_bytes(key, data)
+        await asyncio.to_thread(self.disk.set_bytes, key, data)
+
+    def close(self) -> None:
+        """Close the disk tier's database connection."""
+        self.disk.close()
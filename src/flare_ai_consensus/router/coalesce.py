@@ -0,0 +1,93 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+Under burst load many callers send byte-for-byte identical chat requests at
+the same moment. `SingleFlight` lets concurrent callers with the same request
+key share one upstream call: the first caller starts it, later callers await
+the same task, and everybody receives the result (or the error).
+
+Classes:
+    SingleFlight: Registry of in-flight calls keyed by request hash
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Payload fields that determine the upstream response
+KEY_FIELDS = ("model", "messages", "max_tokens", "temperature")
+
+
+def request_key(payload: Mapping[str, Any]) -> str:
+    """
+    Compute a canonical hash of the fields that determine a response.
+
+    :param payload: A ChatRequest or CompletionRequest payload.
+    :return: A hex SHA-256 digest of model, messages, max_tokens and temperature.
+    """
+    canonical = {field: payload.get(field) for field in KEY_FIELDS}
+    encoded = json.dumps(
+        canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The shared task is cancelled only when every caller waiting on it has
+    been cancelled, so one caller going away does not fail the others.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Run `call`, or join an identical call that is already in flight.
+
+        :param key: The request key, e.g. from `request_key`.
+        :param call: A zero-argument coroutine function making the request.
+        :return: The response; joiners receive a deep copy of it.
+        """
+        flight = self._flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+            logger.debug("coalesced request", key=key[:16], waiters=flight.waiters)
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+        return result if leader else copy.deepcopy(result)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,223 @@
+"""
+Per-model circuit breakers and a health registry.
+
+When a model is down, every consensus round would otherwise keep calling it
+and wait for the HTTP timeout. Each model id gets a circuit breaker fed with
+the outcome and latency of its calls; `send_round` asks the registry which
+models are worth calling.
+
+Classes:
+    CircuitState: closed / open / half-open
+    BreakerConfig: Error-rate, latency and timing thresholds
+    CircuitBreaker: Breaker for a single model id
+    HealthRegistry: Breakers for all model ids, with model selection
+"""
+
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import structlog
+
+from flare_ai_consensus.settings import ModelConfig
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    """
+    Thresholds of a circuit breaker.
+
+    Attributes:
+        window: Number of most recent calls considered
+        min_calls: Calls required in the window before the breaker may open
+        error_rate_threshold: Failure ratio in the window that opens the breaker
+        slow_call_threshold: Calls slower than this (seconds) count as failures
+        open_duration: Seconds an open breaker waits before a trial call
+        half_open_max_calls: Concurrent trial calls allowed while half-open
+    """
+
+    window: int = 20
+    min_calls: int = 5
+    error_rate_threshold: float = 0.5
+    slow_call_threshold: float = 25.0
+    open_duration: float = 30.0
+    half_open_max_calls: int = 1
+
+
+class CircuitBreaker:
+    """
+    A closed / open / half-open circuit breaker for one model id.
+
+    The breaker opens when the failure ratio of the last `window` calls
+    reaches `error_rate_threshold`. After `open_duration` seconds it lets a
+    limited number of trial calls through (half-open): a success closes it,
+    a failure re-opens it. Only trial calls drive those transitions; other
+    calls that end while the breaker is open or half-open (started before it
+    opened, or beyond the trial slots) are counted but change nothing.
+    """
+
+    def __init__(self, config: BreakerConfig) -> None:
+        self.config = config
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.trial_calls = 0
+        self.outcomes: deque[bool] = deque(maxlen=config.window)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def _open_expired(self) -> bool:
+        return time.monotonic() - self.opened_at >= self.config.open_duration
+
+    def is_available(self) -> bool:
+        """Return whether a call would be allowed, without reserving it."""
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.state is CircuitState.OPEN:
+            return self._open_expired()
+        return self.trial_calls < self.config.half_open_max_calls
+
+    def start_trial(self) -> bool:
+        """
+        Reserve a trial slot for a call that is about to be made.
+
+        An open breaker is moved to half-open first, so that a call made
+        while it is open (a model added back to meet the quorum) probes the
+        model. Returns False, reserving nothing, while the breaker is closed
+        or all trial slots are taken.
+        """
+        if self.state is CircuitState.OPEN:
+            self.state = CircuitState.HALF_OPEN
+            self.trial_calls = 0
+        if (
+            self.state is CircuitState.HALF_OPEN
+            and self.trial_calls < self.config.half_open_max_calls
+        ):
+            self.trial_calls += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Release a trial slot whose call ended without a recorded outcome."""
+        if self.state is CircuitState.HALF_OPEN:
+            self.trial_calls = max(0, self.trial_calls - 1)
+
+    def record(
+        self, *, success: bool, latency: float | None = None, trial: bool = False
+    ) -> None:
+        """
+        Record the outcome of a call and update the breaker state.
+
+        :param success: Whether the call succeeded.
+        :param latency: Duration of the call in seconds, if it completed.
+        :param trial: Whether the call held a trial slot from `start_trial`.
+        """
+        ok = success and (latency is None or latency <= self.config.slow_call_threshold)
+        self.outcomes.append(ok)
+        if trial and self.state is CircuitState.HALF_OPEN:
+            self.trial_calls = max(0, self.trial_calls - 1)
+            if ok:
+                self.state = CircuitState.CLOSED
+                self.outcomes.clear()
+            else:
+                self._trip()
+        elif (
+            self.state is CircuitState.CLOSED
+            and len(self.outcomes) >= self.config.min_calls
+            and self.error_rate >= self.config.error_rate_threshold
+        ):
+            self._trip()
+
+    def _trip(self) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker state for reporting."""
+        return {
+            "state": str(self.state),
+            "error_rate": round(self.error_rate, 3),
+            "calls": len(self.outcomes),
+        }
+
+
+class HealthRegistry:
+    """Circuit breakers for every model id seen by a provider."""
+
+    def __init__(self, config: BreakerConfig | None = None) -> None:
+        self.config = config or BreakerConfig()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, model_id: str) -> CircuitBreaker:
+        """Return (creating if needed) the breaker for `model_id`."""
+        if model_id not in self._breakers:
+            self._breakers[model_id] = CircuitBreaker(self.config)
+        return self._breakers[model_id]
+
+    def record(
+        self,
+        model_id: str,
+        *,
+        success: bool,
+        latency: float | None = None,
+        trial: bool = False,
+    ) -> None:
+        """Record the outcome of a call to `model_id`, see CircuitBreaker.record."""
+        breaker = self.breaker(model_id)
+        previous = breaker.state
+        breaker.record(success=success, latency=latency, trial=trial)
+        if breaker.state is not previous:
+            logger.warning(
+                "circuit state changed",
+                model_id=model_id,
+                previous=str(previous),
+                state=str(breaker.state),
+            )
+
+    def select(
+        self, models: Sequence[ModelConfig], min_quorum: int = 1
+    ) -> list[ModelConfig]:
+        """
+        Select the models worth calling, skipping those with an open circuit.
+
+        If fewer than `min_quorum` models are available, open-circuit models
+        are added back (longest-open first) until the quorum can be met.
+
+        :param models: The configured models.
+        :param min_quorum: Minimum number of models to return.
+        :return: The models to call, in their configured order.
+        """
+        allowed = {
+            m.model_id for m in models if self.breaker(m.model_id).is_available()
+        }
+        if len(allowed) < min_quorum:
+            skipped = sorted(
+                (m for m in models if m.model_id not in allowed),
+                key=lambda m: self.breaker(m.model_id).opened_at,
+            )
+            allowed.update(m.model_id for m in skipped[: min_quorum - len(allowed)])
+        return [m for m in models if m.model_id in allowed]
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the state of every breaker for reporting."""
+        return {
+            model_id: {
+                **breaker.snapshot(),
+                "available": breaker.is_available(),
+            }
+            for model_id, breaker in self._breakers.items()
+        }
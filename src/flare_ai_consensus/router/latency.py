@@ -0,0 +1,71 @@
+"""
+Per-model latency tracking.
+
+The provider records how long each successful upstream call took, and how
+long a cancelled (e.g. hedged-out) call had run before it was cancelled,
+keeping a sliding window of recent samples per model. Consumers such as
+request hedging read latency percentiles from it.
+
+Classes:
+    LatencyTracker: Sliding-window latency samples and percentiles per model
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies (in seconds) per model id."""
+
+    def __init__(self, window: int = 200) -> None:
+        """
+        :param window: Number of most recent samples kept per model.
+        """
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model_id: str, seconds: float) -> None:
+        """
+        Record the latency of a call to `model_id`.
+
+        :param model_id: The model that was called.
+        :param seconds: Duration of a successful call, or of a cancelled call
+            up to its cancellation (a lower bound of its latency).
+        """
+        samples = self._samples.get(model_id)
+        if samples is None:
+            samples = self._samples[model_id] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, model_id: str) -> int:
+        """Return the number of samples held for `model_id`."""
+        return len(self._samples.get(model_id, ()))
+
+    def percentile(
+        self, model_id: str, quantile: float, min_samples: int = 1
+    ) -> float | None:
+        """
+        Return a latency percentile for `model_id`.
+
+        :param model_id: The model to look up.
+        :param quantile: The quantile in [0, 1], e.g. 0.9 for p90.
+        :param min_samples: Minimum samples needed for a meaningful estimate.
+        :return: The latency in seconds, or None if there are too few samples.
+        """
+        samples = self._samples.get(model_id)
+        if not samples or len(samples) < min_samples:
+            return None
+        return float(np.quantile(np.fromiter(samples, dtype=float), quantile))
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Return sample count, p50 and p90 for every tracked model."""
+        return {
+            model_id: {
+                "count": len(samples),
+                "p50": float(np.quantile(np.fromiter(samples, dtype=float), 0.5)),
+                "p90": float(np.quantile(np.fromiter(samples, dtype=float), 0.9)),
+            }
+            for model_id, samples in self._samples.items()
+            if samples
+        }
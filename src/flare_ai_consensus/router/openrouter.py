@@ -1,9 +1,32 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
 from flare_ai_consensus.router.base_router import (
     AsyncBaseRouter,
     BaseRouter,
     ChatRequest,
     CompletionRequest,
 )
+from flare_ai_consensus.router.cache import ResponseCache
+from flare_ai_consensus.router.coalesce import SingleFlight, request_key
+from flare_ai_consensus.router.health import HealthRegistry
+from flare_ai_consensus.router.latency import LatencyTracker
+from flare_ai_consensus.router.rate_limit import AsyncRateLimiter
+from flare_ai_consensus.router.retry import RetryPolicy, UpstreamStatusError
+from flare_ai_consensus.utils import parse_chat_delta
+
+
+def _is_model_failure(error: Exception) -> bool:
+    """
+    Return whether an error reflects on the model's health.
+
+    Client errors such as 400 (bad request) or 402 (insufficient credits)
+    say nothing about the model; timeouts, 429 and 5xx do.
+    """
+    if isinstance(error, UpstreamStatusError):
+        return error.status_code >= 500 or error.status_code in {408, 429}  # noqa: PLR2004
+    return True
 
 
 class OpenRouterProvider(BaseRouter):
@@ -80,16 +103,32 @@ class OpenRouterProvider(BaseRouter):
 class AsyncOpenRouterProvider(AsyncBaseRouter):
     """Asynchronous provider to interact with the OpenRouter API."""
 
-    def __init__(
-        self, api_key: str | None = None, base_url: str = "https://openrouter.ai/api/v1"
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str | None = None,
+        base_url: str = "https://openrouter.ai/api/v1",
+        *,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: AsyncRateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        health: HealthRegistry | None = None,
     ) -> None:
         """
         Initialize the AsyncOpenRouterProvider.
 
         :param api_key: Optional API key for authentication.
         :param base_url: Optional custom base URL.
-        """
-        super().__init__(base_url, api_key)
+        :param retry_policy: Optional RetryPolicy for failed requests.
+        :param rate_limiter: Optional AsyncRateLimiter shared across providers.
+        :param cache: Optional ResponseCache for deterministic chat completions.
+        :param health: Optional HealthRegistry fed with the outcome of every
+            chat completion. Defaults to a new registry.
+        """
+        super().__init__(base_url, api_key, retry_policy, rate_limiter)
+        self.single_flight = SingleFlight()
+        self.cache = cache
+        self.latency = LatencyTracker()
+        self.health = health or HealthRegistry()
 
     async def send_completion(self, payload: CompletionRequest) -> dict:
         """
@@ -101,12 +140,105 @@ class AsyncOpenRouterProvider(AsyncBaseRouter):
         endpoint = "/completions"
         return await self._post(endpoint, payload)
 
-    async def send_chat_completion(self, payload: ChatRequest) -> dict:
+    async def send_chat_completion(
+        self,
+        payload: ChatRequest,
+        *,
+        coalesce: bool = False,
+        cache: bool | None = None,
+    ) -> dict:
         """
         Send a prompt to the chat completions endpoint.
 
+        With `coalesce=True`, concurrent calls with the same model, messages,
+        max_tokens and temperature share a single upstream request. This is
+        opt-in because independent samples are sometimes wanted at
+        temperature > 0.
+
+        If the provider has a cache, responses to deterministic requests
+        (temperature 0) are served from and stored in it; `cache` overrides
+        that choice per request.
+
         :param payload: The JSON payload.
+        :param coalesce: Join an identical in-flight request if there is one.
+        :param cache: Force (True) or bypass (False) the response cache.
         :return: The JSON response from the API.
         """
         endpoint = "/chat/completions"
-        return await self._post(endpoint, payload)
+        use_cache = self.cache is not None and (
+            cache if cache is not None else payload["temperature"] == 0
+        )
+        key = request_key(payload) if coalesce or use_cache else ""
+        if use_cache and self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> dict:
+            return await self._fetch_chat_completion(
+                endpoint, payload, key if use_cache else None
+            )
+
+        if coalesce:
+            return await self.single_flight.do(key, fetch)
+        return await fetch()
+
+    async def _fetch_chat_completion(
+        self, endpoint: str, payload: ChatRequest, cache_key: str | None
+    ) -> dict:
+        """
+        Post a chat completion, feeding its outcome to the latency tracker and
+        the model's circuit breaker.
+
+        The breaker's trial slot is reserved here rather than when the models
+        are selected, so cache hits and coalesced joiners never hold one; a
+        call that ends without a recorded outcome releases it. Only calls
+        holding a slot move the breaker out of half-open.
+
+        :param endpoint: The chat completions endpoint.
+        :param payload: The JSON payload.
+        :param cache_key: Key to store the response under, if it is cached.
+        :return: The JSON response from the API.
+        """
+        model_id = payload["model"]
+        breaker = self.health.breaker(model_id)
+        trial = breaker.start_trial()
+        start = time.monotonic()
+        try:
+            response = await self._post(endpoint, payload)
+        except asyncio.CancelledError:
+            # A cancelled (e.g. hedged-out) call was at least this slow;
+            # dropping it would bias the percentiles towards fast calls.
+            self.latency.record(model_id, time.monotonic() - start)
+            if trial:
+                breaker.release()
+            raise
+        except Exception as e:
+            if _is_model_failure(e):
+                self.health.record(model_id, success=False, trial=trial)
+            elif trial:
+                breaker.release()
+            raise
+        elapsed = time.monotonic() - start
+        self.latency.record(model_id, elapsed)
+        self.health.record(model_id, success=True, latency=elapsed, trial=trial)
+        if cache_key is not None and self.cache is not None and "error" not in response:
+            await self.cache.set(cache_key, response)
+        return response
+
+    async def stream_chat_completion(self, payload: ChatRequest) -> AsyncIterator[str]:
+        """
+        Send a prompt to the chat completions endpoint in streaming mode.
+
+        Content deltas are yielded as soon as the provider emits them, so the
+        first token is available after the model's time-to-first-token rather
+        than after the full completion.
+
+        :param payload: The JSON payload.
+        :return: An async iterator over the response text deltas.
+        """
+        endpoint = "/chat/completions"
+        async for chunk in self._post_stream(endpoint, payload):
+            delta = parse_chat_delta(chunk)
+            if delta:
+                yield delta
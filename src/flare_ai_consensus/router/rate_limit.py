@@ -0,0 +1,171 @@
+"""
+Client-side rate limiting for upstream API calls.
+
+Requests are throttled before they are sent, so bursts from `send_round`
+stay within the provider's limits instead of tripping 429s and falling back
+on retries. Limits are enforced with token buckets per model id and per API
+key; callers waiting on the same bucket are served in arrival order.
+
+Classes:
+    RateLimit: Requests-per-second and tokens-per-minute limits
+    TokenBucket: Continuously refilled asyncio token bucket
+    AsyncRateLimiter: Per-model and per-key buckets shared by providers
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from flare_ai_consensus.utils.token_utils import (
+    estimate_message_tokens,
+    estimate_tokens,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Waits shorter than this (seconds) are not worth logging
+MIN_LOGGED_WAIT = 0.01
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Limits applied to one bucket pair. A limit of None disables that bucket.
+
+    Attributes:
+        requests_per_second: Sustained request rate
+        tokens_per_minute: Sustained prompt plus completion token rate
+    """
+
+    requests_per_second: float | None = None
+    tokens_per_minute: float | None = None
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket refilled continuously at `rate` tokens per second.
+
+    Waiters queue on an asyncio.Lock, which wakes them in FIFO order, so a
+    large request cannot be starved by a stream of small ones.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        :param rate: Refill rate in tokens per second.
+        :param capacity: Maximum burst size in tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Requests larger than the bucket capacity wait for a full bucket.
+
+        :param amount: The number of tokens to take.
+        :return: The time spent waiting, in seconds.
+        """
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+        return time.monotonic() - start
+
+
+@dataclass
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter keyed by model id and by API key.
+
+    A single instance can be shared by several providers so that limits hold
+    across all of them. Buckets are created lazily on first use.
+
+    Attributes:
+        per_model: Default limits applied to each model id
+        per_key: Limits applied to each API key
+        model_overrides: Limits for specific model ids, replacing `per_model`
+    """
+
+    per_model: RateLimit = field(default_factory=RateLimit)
+    per_key: RateLimit = field(default_factory=RateLimit)
+    model_overrides: Mapping[str, RateLimit] = field(default_factory=dict)
+    _buckets: dict[tuple[str, str, str], TokenBucket] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def _bucket(
+        self, scope: str, name: str, kind: str, limit: RateLimit
+    ) -> TokenBucket | None:
+        """Return (creating if needed) the bucket for a scope/name/kind."""
+        key = (scope, name, kind)
+        if key not in self._buckets:
+            if kind == "requests" and limit.requests_per_second:
+                rate = limit.requests_per_second
+                self._buckets[key] = TokenBucket(rate, capacity=max(1.0, rate))
+            elif kind == "tokens" and limit.tokens_per_minute:
+                rate = limit.tokens_per_minute / 60
+                self._buckets[key] = TokenBucket(rate, limit.tokens_per_minute)
+            else:
+                return None
+        return self._buckets[key]
+
+    async def acquire(
+        self, model_id: str, api_key: str | None = None, tokens: int = 0
+    ) -> None:
+        """
+        Wait until a request for `model_id` with `tokens` tokens may be sent.
+
+        Buckets are always taken in the same order (key before model,
+        requests before tokens) so concurrent callers cannot deadlock.
+
+        :param model_id: The model the request is sent to.
+        :param api_key: The API key the request is sent with.
+        :param tokens: Estimated prompt plus completion tokens of the request.
+        """
+        key_id = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        model_limit = self.model_overrides.get(model_id, self.per_model)
+        buckets = [
+            (self._bucket("key", key_id, "requests", self.per_key), 1.0),
+            (self._bucket("key", key_id, "tokens", self.per_key), tokens),
+            (self._bucket("model", model_id, "requests", model_limit), 1.0),
+            (self._bucket("model", model_id, "tokens", model_limit), tokens),
+        ]
+        waited = 0.0
+        for bucket, amount in buckets:
+            if bucket is not None:
+                waited += await bucket.acquire(amount)
+        if waited > MIN_LOGGED_WAIT:
+            logger.debug("rate limited", model_id=model_id, waited=round(waited, 3))
+
+
+def estimate_request_tokens(payload: Mapping[str, Any]) -> int:
+    """
+    Estimate the prompt plus completion tokens a request may consume.
+
+    :param payload: A ChatRequest or CompletionRequest payload.
+    :return: The estimated token count.
+    """
+    model_id = payload.get("model")
+    if "messages" in payload:
+        prompt_tokens = estimate_message_tokens(payload["messages"], model_id)
+    else:
+        prompt_tokens = estimate_tokens(payload.get("prompt", ""), model_id)
+    return prompt_tokens + int(payload.get("max_tokens", 0))
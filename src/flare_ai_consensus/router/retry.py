@@ -0,0 +1,199 @@
+"""
+Retry policies for upstream API calls.
+
+A single rate-limited or failing model should cost a bounded amount of extra
+latency, not a full re-run of the consensus round. This module provides the
+retry engine used by `AsyncBaseRouter`: per-status retry policies, support for
+the `Retry-After` header, decorrelated-jitter backoff and a deadline budget
+across all attempts of a request.
+
+Classes:
+    UpstreamStatusError: Raised when the API answers with a non-200 status
+    StatusPolicy: Retry rule for a single HTTP status code
+    RetryPolicy: Backoff parameters, deadline and per-status rules
+"""
+
+import asyncio
+import datetime as dt
+import random
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Final
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class UpstreamStatusError(ConnectionError):
+    """
+    Raised when the API answers with a non-success status code.
+
+    Subclasses ConnectionError so existing callers keep working; the status
+    code and any `Retry-After` delay are kept for the retry engine.
+    """
+
+    def __init__(
+        self, status_code: int, body: str, retry_after: float | None = None
+    ) -> None:
+        super().__init__(f"Error ({status_code}): {body}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "UpstreamStatusError":
+        """Build the error from a (fully read) httpx response."""
+        return cls(
+            response.status_code,
+            response.text,
+            parse_retry_after(response.headers.get("retry-after")),
+        )
+
+
+@dataclass(frozen=True)
+class StatusPolicy:
+    """
+    Retry rule for a single HTTP status code.
+
+    Attributes:
+        max_attempts: Attempts allowed to fail with this status before giving up
+        honour_retry_after: Wait at least the server's `Retry-After` delay
+    """
+
+    max_attempts: int
+    honour_retry_after: bool = True
+
+
+DEFAULT_STATUS_POLICIES: Final[Mapping[int, StatusPolicy]] = {
+    408: StatusPolicy(max_attempts=3),
+    429: StatusPolicy(max_attempts=5),
+    500: StatusPolicy(max_attempts=2),
+    502: StatusPolicy(max_attempts=3),
+    503: StatusPolicy(max_attempts=3),
+    504: StatusPolicy(max_attempts=3),
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Backoff parameters, deadline budget and per-status rules for a request.
+
+    Statuses without an entry in `status_policies` are not retried. Transport
+    failures (connection errors, timeouts) are allowed `transport_max_attempts`
+    attempts. Attempt budgets are tracked separately per status code. No
+    retry is scheduled that would start after `deadline` seconds from the
+    first attempt; the last error is raised instead.
+
+    Attributes:
+        base_delay: Lower bound of the backoff delay in seconds
+        max_delay: Upper bound of the backoff delay in seconds
+        deadline: Total time budget across all attempts in seconds
+        transport_max_attempts: Attempts allowed to fail at the transport level
+        status_policies: Retry rule per HTTP status code
+    """
+
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    deadline: float = 60.0
+    transport_max_attempts: int = 3
+    status_policies: Mapping[int, StatusPolicy] = field(
+        default_factory=lambda: dict(DEFAULT_STATUS_POLICIES)
+    )
+
+    def max_attempts_for(self, error: Exception) -> int:
+        """Return the number of failed attempts allowed for this kind of error."""
+        if isinstance(error, UpstreamStatusError):
+            status_policy = self.status_policies.get(error.status_code)
+            return status_policy.max_attempts if status_policy else 1
+        if isinstance(error, httpx.TransportError):
+            return self.transport_max_attempts
+        return 1
+
+    def next_delay(self, previous_delay: float, error: Exception) -> float:
+        """
+        Compute the next backoff delay using decorrelated jitter.
+
+        The delay is drawn uniformly from [base_delay, 3 * previous_delay] and
+        capped at max_delay. A server-provided `Retry-After` acts as a floor
+        when the status policy honours it.
+        """
+        upper = max(self.base_delay, previous_delay * 3)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))  # noqa: S311
+        if isinstance(error, UpstreamStatusError) and error.retry_after is not None:
+            status_policy = self.status_policies.get(error.status_code)
+            if status_policy and status_policy.honour_retry_after:
+                delay = max(delay, error.retry_after)
+        return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a `Retry-After` header value into a delay in seconds.
+
+    :param value: Either a number of seconds or an HTTP date.
+    :return: The delay in seconds, or None if absent or unparsable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt.UTC)
+    now = dt.datetime.now(tz=dt.UTC)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+async def retry_call[T](
+    policy: RetryPolicy, call: Callable[[], Awaitable[T]], endpoint: str = ""
+) -> T:
+    """
+    Await `call` until it succeeds or the retry policy gives up.
+
+    :param policy: The RetryPolicy to apply.
+    :param call: A zero-argument coroutine function performing one attempt.
+    :param endpoint: The endpoint being called, for logging.
+    :return: The result of the first successful attempt.
+    :raises: The last error once attempts or the deadline budget are exhausted.
+    """
+    start = time.monotonic()
+    delay = policy.base_delay
+    failures: dict[int | None, int] = {}
+    while True:
+        try:
+            return await call()
+        except (UpstreamStatusError, httpx.TransportError) as e:
+            # Attempts are budgeted per status code (None for transport errors)
+            kind = e.status_code if isinstance(e, UpstreamStatusError) else None
+            failures[kind] = failures.get(kind, 0) + 1
+            attempt = sum(failures.values())
+            if failures[kind] >= policy.max_attempts_for(e):
+                raise
+            delay = policy.next_delay(delay, e)
+            elapsed = time.monotonic() - start
+            if elapsed + delay > policy.deadline:
+                logger.warning(
+                    "retry deadline exceeded",
+                    endpoint=endpoint,
+                    attempt=attempt,
+                    elapsed=round(elapsed, 3),
+                    error=str(e),
+                )
+                raise
+            logger.warning(
+                "retrying request",
+                endpoint=endpoint,
+                attempt=attempt,
+                delay=round(delay, 3),
+                error=str(e),
+            )
+            await asyncio.sleep(delay)
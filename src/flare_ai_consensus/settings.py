@@ -30,6 +30,11 @@ class ModelConfig(BaseModel):
     model_id: str
     max_tokens: int = 50
     temperature: float = 0.7
+    # Serve repeated identical requests from the response cache even when
+    # temperature > 0 (temperature 0 requests are always cacheable)
+    cacheable: bool = False
+    # Context window in tokens; bounds the aggregator prompt when set
+    context_length: int | None = None
 
 
 class AggregatorConfig(BaseModel):
@@ -39,6 +44,45 @@ class AggregatorConfig(BaseModel):
     approach: str
     context: list[Message]
     prompt: list[Message]
+    # Minimum confidence of a local approach ("medoid", "majority",
+    # "exact_match") before falling back to the LLM aggregator
+    confidence_threshold: float = 0.6
+    # Maximum responses per LLM aggregator call; larger ensembles are
+    # aggregated in a tree of calls. None sends all responses at once
+    fan_in: int | None = None
+    # Estimated Jaccard similarity at which responses are collapsed into one
+    # weighted representative before an LLM aggregator call
+    dedup_threshold: float | None = None
+
+
+class HedgingConfig(BaseModel):
+    """Configuration for hedged model requests"""
+
+    # Hedge once a model is slower than this latency quantile
+    percentile: float = 0.9
+    # Latency samples required before a model is hedged
+    min_samples: int = 20
+    # Backup model per model_id; models without an entry are hedged with
+    # a duplicate request to the same model
+    fallbacks: dict[str, ModelConfig] = {}
+
+    @classmethod
+    def from_json(cls, json_data: dict) -> "HedgingConfig":
+        """Create HedgingConfig from JSON data"""
+        return cls(
+            percentile=json_data.get("percentile", 0.9),
+            min_samples=json_data.get("min_samples", 20),
+            fallbacks={
+                model_id: ModelConfig(
+                    model_id=m["id"],
+                    max_tokens=m["max_tokens"],
+                    temperature=m["temperature"],
+                    cacheable=m.get("cacheable", False),
+                    context_length=m.get("context_length"),
+                )
+                for model_id, m in json_data.get("fallbacks", {}).items()
+            },
+        )
 
 
 class ConsensusConfig(BaseModel):
@@ -49,6 +93,18 @@ class ConsensusConfig(BaseModel):
     improvement_prompt: str
     iterations: int
     aggregated_prompt_type: Literal["user", "assistant", "system"]
+    # Minimum number of models a round is sent to, even if some of them
+    # have an open circuit breaker
+    min_quorum: int = 1
+    # Responses a round waits for: None for all models, an int k for k-of-n
+    # or a float in (0, 1] for a fraction of the models
+    quorum: int | float | None = None
+    # Seconds after which a round stops waiting and cancels slower models
+    round_deadline: float | None = None
+    # Similarity in [0, 1] at which the responses count as converged and the
+    # remaining improvement rounds are skipped; None always runs every round
+    convergence_threshold: float | None = None
+    hedging: HedgingConfig | None = None
 
     @classmethod
     def from_json(cls, json_data: dict) -> "ConsensusConfig":
@@ -59,6 +115,8 @@ class ConsensusConfig(BaseModel):
                 model_id=m["id"],
                 max_tokens=m["max_tokens"],
                 temperature=m["temperature"],
+                cacheable=m.get("cacheable", False),
+                context_length=m.get("context_length"),
             )
             for m in json_data.get("models", [])
         ]
@@ -70,6 +128,8 @@ class ConsensusConfig(BaseModel):
             model_id=aggr_model_data["id"],
             max_tokens=aggr_model_data["max_tokens"],
             temperature=aggr_model_data["temperature"],
+            cacheable=aggr_model_data.get("cacheable", False),
+            context_length=aggr_model_data.get("context_length"),
         )
 
         aggregator_config = AggregatorConfig(
@@ -77,6 +137,9 @@ class ConsensusConfig(BaseModel):
             approach=aggr_data.get("approach", ""),
             context=aggr_data.get("aggregator_context", []),
             prompt=aggr_data.get("aggregator_prompt", []),
+            confidence_threshold=aggr_data.get("confidence_threshold", 0.6),
+            fan_in=aggr_data.get("fan_in"),
+            dedup_threshold=aggr_data.get("dedup_threshold"),
         )
 
         return cls(
@@ -85,6 +148,13 @@ class ConsensusConfig(BaseModel):
             improvement_prompt=json_data.get("improvement_prompt", ""),
             iterations=json_data.get("iterations", 1),
             aggregated_prompt_type=json_data.get("aggregated_prompt_type", "system"),
+            min_quorum=json_data.get("min_quorum", 1),
+            quorum=json_data.get("quorum"),
+            round_deadline=json_data.get("round_deadline"),
+            convergence_threshold=json_data.get("convergence_threshold"),
+            hedging=HedgingConfig.from_json(json_data["hedging"])
+            if "hedging" in json_data
+            else None,
         )
 
 
@@ -97,6 +167,20 @@ class Settings(BaseSettings):
     # OpenRouter Settings
     open_router_base_url: str = "https://openrouter.ai/api/v1"
     open_router_api_key: str = os.environ["OPENROUTER_API_KEY"]
+    # Time budget (seconds) across all retries of a single OpenRouter request
+    open_router_retry_deadline: float = 60.0
+    # Client-side rate limits per model id and per API key (None disables)
+    model_requests_per_second: float | None = None
+    model_tokens_per_minute: float | None = None
+    key_requests_per_second: float | None = None
+    key_tokens_per_minute: float | None = None
+
+    # Response cache for deterministic chat completions
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 64 << 20
+    response_cache_ttl: float = 3600
+    # Optional SQLite file for a persistent second cache tier
+    response_cache_path: Path | None = None
 
     # Path Settings
     data_path: Path = create_path("data")
@@ -107,6 +191,13 @@ class Settings(BaseSettings):
 
     # Consensus Settings
     consensus_config: ConsensusConfig | None = None
+    # Background consensus jobs: concurrent runs, queued jobs, and seconds a
+    # finished job's result is kept
+    consensus_job_workers: int = 2
+    consensus_job_max_pending: int = 100
+    consensus_job_ttl: float = 3600
+    # Optional directory storing the trace of every consensus run
+    consensus_trace_path: Path | None = None
 
     model_config = SettingsConfigDict(
         env_file=".env",
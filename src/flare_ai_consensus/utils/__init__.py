@@ -1,10 +1,17 @@
 from .file_utils import load_json, load_txt, save_json
-from .parser_utils import extract_author, parse_chat_response
+from .parser_utils import extract_author, parse_chat_delta, parse_chat_response
+from .token_utils import estimate_message_tokens, estimate_tokens
+from .trace_utils import TraceWriter, read_traces
 
 __all__ = [
+    "TraceWriter",
+    "estimate_message_tokens",
+    "estimate_tokens",
     "extract_author",
     "load_json",
     "load_txt",
+    "parse_chat_delta",
     "parse_chat_response",
+    "read_traces",
     "save_json",
 ]
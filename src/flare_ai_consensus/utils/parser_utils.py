@@ -3,6 +3,12 @@ def parse_chat_response(response: dict) -> str:
     return response.get("choices", [])[0].get("message", {}).get("content", "")
 
 
+def parse_chat_delta(chunk: dict) -> str:
+    """Parse a streamed chunk from chat completion endpoint"""
+    choices = chunk.get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content") or ""
+
+
 def extract_author(model_id: str) -> tuple[str, str]:
     """
     Extract the author and slug from a model_id.
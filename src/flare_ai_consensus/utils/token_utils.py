@@ -0,0 +1,91 @@
+import math
+from collections.abc import Iterable
+
+from flare_ai_consensus.settings import Message
+
+# Rough average ASCII characters per token, per model family (the model id
+# prefix); approximations for English text, not exact tokenizer counts.
+CHARS_PER_TOKEN_BY_FAMILY = {
+    "openai": 4.0,
+    "anthropic": 3.5,
+    "google": 4.0,
+    "meta-llama": 3.8,
+    "mistralai": 3.6,
+    "deepseek": 3.7,
+    "qwen": 3.4,
+    "microsoft": 3.8,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Non-ASCII characters (CJK, emoji, accented text) rarely share a token
+NON_ASCII_TOKENS_PER_CHAR = 1.0
+
+# Role and separator tokens added by chat templates per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def model_family(model_id: str | None) -> str:
+    """Return the family of a model id, e.g. "google" for "google/gemini-pro"."""
+    return (model_id or "").split("/", 1)[0]
+
+
+def chars_per_token(model_id: str | None) -> float:
+    """Return the approximate ASCII characters per token for a model id."""
+    return CHARS_PER_TOKEN_BY_FAMILY.get(
+        model_family(model_id), DEFAULT_CHARS_PER_TOKEN
+    )
+
+
+def estimate_tokens(text: str, model_id: str | None = None) -> int:
+    """
+    Estimate the number of tokens of `text` without a tokenizer.
+
+    :param text: The text to count.
+    :param model_id: The model whose tokenizer is approximated.
+    :return: The estimated token count, rounded up.
+    """
+    if text.isascii():
+        return math.ceil(len(text) / chars_per_token(model_id))
+    non_ascii = sum(not ch.isascii() for ch in text)
+    ascii_chars = len(text) - non_ascii
+    return math.ceil(
+        ascii_chars / chars_per_token(model_id) + non_ascii * NON_ASCII_TOKENS_PER_CHAR
+    )
+
+
+def estimate_message_tokens(
+    messages: Iterable[Message], model_id: str | None = None
+) -> int:
+    """
+    Estimate the prompt tokens of a list of chat messages.
+
+    :param messages: The chat messages.
+    :param model_id: The model whose tokenizer is approximated.
+    :return: The estimated token count, including per-message overhead.
+    """
+    return sum(
+        estimate_tokens(m.get("content", ""), model_id) + MESSAGE_OVERHEAD_TOKENS
+        for m in messages
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_id: str | None = None) -> str:
+    """
+    Truncate `text` to about `max_tokens` tokens, at a word boundary if possible.
+
+    :param text: The text to truncate.
+    :param max_tokens: The token budget.
+    :param model_id: The model whose tokenizer is approximated.
+    :return: The text, unchanged if it fits, otherwise cut and marked with an
+        ellipsis.
+    """
+    if estimate_tokens(text, model_id) <= max_tokens:
+        return text
+    cut = text[: max(0, int(max_tokens * chars_per_token(model_id)))]
+    # Shrink further if non-ASCII characters made the cut too long.
+    while cut and estimate_tokens(cut, model_id) > max_tokens:
+        cut = cut[: len(cut) * 3 // 4]
+    space = cut.rfind(" ")
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + " …"
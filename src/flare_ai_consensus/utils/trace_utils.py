@@ -0,0 +1,197 @@
+import asyncio
+import gzip
+import json
+import time
+from collections.abc import AsyncIterator
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Self
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SEGMENT_PREFIX = "trace-"
+
+# Maximum traces written (and compressed) together
+WRITE_BATCH_TRACES = 64
+
+# Lines read from a segment per worker-thread call
+READ_BATCH_LINES = 256
+
+
+class TraceWriter:
+    """
+    Append-only, rotating JSONL log of consensus traces.
+
+    `submit` only enqueues a trace; a background task drains the queue and
+    writes batches of traces from a worker thread, so callers never block on
+    disk I/O. With `compress`, every batch is appended as its own gzip member,
+    so a segment stays readable up to the last completed batch even after a
+    crash. A new segment is started once the current one reaches
+    `segment_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_queue: int = 1024,
+        segment_bytes: int = 64 << 20,
+        compress: bool = True,
+    ) -> None:
+        """
+        :param directory: Directory holding the trace segments.
+        :param max_queue: Maximum number of traces waiting to be written;
+            further traces are dropped until the writer catches up.
+        :param segment_bytes: Size in bytes after which a segment is rotated.
+        :param compress: Write gzip-compressed segments.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.compress = compress
+        self.written = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(max_queue)
+        self._task: asyncio.Task[None] | None = None
+        self._segment: Path | None = None
+        self._segment_size = 0
+        self._sequence = 0
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Create the trace directory and start the background writer."""
+        if self._task is None:
+            await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Write every queued trace and stop the background writer.
+
+        :raises Exception: The error that stopped the background writer, if
+            it died before draining the queue.
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        # Stop waiting for queue space if the writer dies, it would never free any
+        stop = asyncio.create_task(self._queue.put(None))
+        try:
+            await asyncio.wait({stop, task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+        await task
+
+    def submit(self, trace: dict[str, Any]) -> bool:
+        """
+        Queue a trace for writing without blocking.
+
+        :param trace: A JSON-serialisable trace, e.g. a run's response_data.
+        :return: False if the queue was full and the trace was dropped.
+        """
+        try:
+            self._queue.put_nowait({"timestamp": time.time(), **trace})
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("trace queue full, dropping trace", dropped=self.dropped)
+            return False
+        return True
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [await self._queue.get()]
+            while not self._queue.empty() and len(batch) < WRITE_BATCH_TRACES:
+                batch.append(self._queue.get_nowait())
+            stopping = None in batch
+            traces = [trace for trace in batch if trace is not None]
+            if not traces:
+                continue
+            try:
+                await asyncio.to_thread(self._write, traces)
+            except OSError:
+                logger.exception("failed to write traces", count=len(traces))
+            else:
+                self.written += len(traces)
+
+    def _write(self, traces: list[dict[str, Any]]) -> None:
+        data = "".join(
+            json.dumps(trace, separators=(",", ":"), default=str) + "\n"
+            for trace in traces
+        ).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data)
+        if self._segment is None or self._segment_size >= self.segment_bytes:
+            self._segment = self._new_segment()
+            self._segment_size = 0
+        with self._segment.open("ab") as f:
+            f.write(data)
+        self._segment_size += len(data)
+
+    def _new_segment(self) -> Path:
+        self._sequence += 1
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        name = f"{SEGMENT_PREFIX}{time.time_ns()}-{self._sequence:06d}{suffix}"
+        logger.debug("starting trace segment", segment=name)
+        return self.directory / name
+
+
+def _open_segment(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def _read_batch(f: IO[str], segment: Path) -> tuple[list[dict[str, Any]], bool]:
+    """Read up to READ_BATCH_LINES traces; the flag is False at end of segment."""
+    traces = []
+    lines = 0
+    try:
+        for line in islice(f, READ_BATCH_LINES):
+            lines += 1
+            try:
+                traces.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning("skipping corrupt trace line", segment=segment.name)
+    except (OSError, EOFError):
+        logger.warning("stopped reading truncated segment", segment=segment.name)
+        return traces, False
+    return traces, lines > 0
+
+
+async def read_traces(directory: Path) -> AsyncIterator[dict[str, Any]]:
+    """
+    Stream the traces written by a TraceWriter, oldest segment first.
+
+    Segments are read in batches from a worker thread. Corrupt lines are
+    skipped, and a truncated segment is read up to the point of truncation.
+
+    :param directory: Directory holding the trace segments.
+    :return: An async iterator of traces.
+    """
+    segments = sorted(
+        await asyncio.to_thread(lambda: list(directory.glob(f"{SEGMENT_PREFIX}*")))
+    )
+    for segment in segments:
+        f = await asyncio.to_thread(_open_segment, segment)
+        try:
+            more = True
+            while more:
+                traces, more = await asyncio.to_thread(_read_batch, f, segment)
+                for trace in traces:
+                    yield trace
+        finally:
+            f.close()
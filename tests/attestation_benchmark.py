@@ -0,0 +1,349 @@
+import argparse
+import base64
+import datetime as dt
+import json
+import logging
+import statistics
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import override
+
+import jwt
+import structlog
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from flare_ai_consensus.attestation import VtpmValidation
+
+logger = structlog.get_logger(__name__)
+
+OIDC_ENDPOINT = "/.well-known/openid-configuration"
+PKI_ENDPOINT = "/.well-known/confidential_space_root.crt"
+KID = "benchmark-key"
+
+# Validator of each process pool worker, created by _init_worker
+_WORKER: dict[str, VtpmValidation] = {}
+
+
+def configure_logging() -> None:
+    # Keep the validators' debug events out of the timed loops
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO)
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure VtpmValidation throughput against a local fake issuer."
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=1000, help="Tokens per warm scenario."
+    )
+    parser.add_argument(
+        "--cold", type=int, default=50, help="Validations per cold scenario."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Processes in the process pool."
+    )
+    return parser.parse_args()
+
+
+def _name(common_name: str) -> x509.Name:
+    return x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+
+
+def _certificate(  # noqa: PLR0913
+    subject: str,
+    key: rsa.RSAPrivateKey,
+    issuer: str,
+    issuer_key: rsa.RSAPrivateKey,
+    *,
+    ca: bool,
+    days: int,
+) -> x509.Certificate:
+    now = dt.datetime.now(tz=dt.UTC)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(_name(subject))
+        .issuer_name(_name(issuer))
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    if ca:
+        builder = builder.add_extension(
+            x509.KeyUsage(
+                digital_signature=True,
+                content_commitment=False,
+                key_encipherment=False,
+                data_encipherment=False,
+                key_agreement=False,
+                key_cert_sign=True,
+                crl_sign=True,
+                encipher_only=False,
+                decipher_only=False,
+            ),
+            critical=True,
+        )
+    return builder.sign(issuer_key, hashes.SHA256())
+
+
+class FakeIssuer:
+    """
+    Local stand-in for the Confidential Space token issuer.
+
+    Serves the OpenID configuration, a JWKS and a self-signed root certificate,
+    and mints RS256 tokens for the OIDC scheme and, through a generated
+    root -> intermediate -> leaf chain, for the PKI (x5c) scheme.
+    """
+
+    def __init__(self) -> None:
+        self.oidc_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        root_key, intermediate_key, self.leaf_key = (
+            rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            for _ in range(3)
+        )
+        self.root_cert = _certificate(
+            "Benchmark Root", root_key, "Benchmark Root", root_key, ca=True, days=3650
+        )
+        intermediate_cert = _certificate(
+            "Benchmark Intermediate",
+            intermediate_key,
+            "Benchmark Root",
+            root_key,
+            ca=True,
+            days=365,
+        )
+        leaf_cert = _certificate(
+            "Benchmark Leaf",
+            self.leaf_key,
+            "Benchmark Intermediate",
+            intermediate_key,
+            ca=False,
+            days=30,
+        )
+        self.x5c = [
+            base64.b64encode(cert.public_bytes(serialization.Encoding.DER)).decode()
+            for cert in (leaf_cert, intermediate_cert, self.root_cert)
+        ]
+        self.root_fingerprint = ":".join(
+            format(b, "02x")
+            for b in self.root_cert.fingerprint(hashes.SHA1())  # noqa: S303
+        ).upper()
+        self.requests = 0
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            msg = "Fake issuer is not running"
+            raise RuntimeError(msg)
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> None:
+        documents = self._documents()
+        issuer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                issuer.requests += 1
+                document = documents().get(self.path)
+                if document is None:
+                    self.send_error(404)
+                    return
+                body, content_type = document
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "public, max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+
+            @override
+            def log_message(self, format: str, /, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info("fake issuer started", url=self.url)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    def _documents(self) -> Callable[[], dict[str, tuple[bytes, str]]]:
+        numbers = self.oidc_key.public_key().public_numbers()
+
+        def b64url(value: int) -> str:
+            raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+            return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+        jwks = {
+            "keys": [
+                {
+                    "kty": "RSA",
+                    "alg": "RS256",
+                    "use": "sig",
+                    "kid": KID,
+                    "n": b64url(numbers.n),
+                    "e": b64url(numbers.e),
+                }
+            ]
+        }
+        root_pem = self.root_cert.public_bytes(serialization.Encoding.PEM)
+
+        def documents() -> dict[str, tuple[bytes, str]]:
+            configuration = {"issuer": self.url, "jwks_uri": self.url + "/jwks"}
+            return {
+                OIDC_ENDPOINT: (json.dumps(configuration).encode(), "application/json"),
+                "/jwks": (json.dumps(jwks).encode(), "application/json"),
+                PKI_ENDPOINT: (root_pem, "application/x-pem-file"),
+            }
+
+        return documents
+
+    def mint(self, scheme: str, count: int) -> list[str]:
+        """Mint `count` distinct tokens for the "oidc" or "pki" scheme."""
+        now = int(time.time())
+        if scheme == "oidc":
+            key, headers = self.oidc_key, {"kid": KID}
+        else:
+            key, headers = self.leaf_key, {"x5c": self.x5c}
+        return [
+            jwt.encode(
+                {
+                    "iss": self.url,
+                    "iat": now,
+                    "exp": now + 3600,
+                    "eat_nonce": [f"benchmark-nonce-{i:08d}"],
+                },
+                key,
+                algorithm="RS256",
+                headers=headers,
+            )
+            for i in range(count)
+        ]
+
+
+def new_validator(issuer_url: str, root_fingerprint: str) -> VtpmValidation:
+    return VtpmValidation(
+        expected_issuer=issuer_url,
+        oidc_endpoint=OIDC_ENDPOINT,
+        pki_endpoint=PKI_ENDPOINT,
+        root_fingerprint=root_fingerprint,
+    )
+
+
+def time_validations(
+    validate: Callable[[str], object], tokens: Sequence[str]
+) -> tuple[float, list[float]]:
+    """Validate every token, returning the wall time and per-token latencies."""
+    latencies = []
+    start = time.perf_counter()
+    for token in tokens:
+        before = time.perf_counter()
+        validate(token)
+        latencies.append(time.perf_counter() - before)
+    return time.perf_counter() - start, latencies
+
+
+def report(scenario: str, elapsed: float, latencies: list[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    logger.info(
+        "benchmark",
+        scenario=scenario,
+        validations=len(latencies),
+        per_sec=round(len(latencies) / elapsed),
+        p50_ms=round(percentiles[49] * 1000, 3),
+        p90_ms=round(percentiles[89] * 1000, 3),
+        p99_ms=round(percentiles[98] * 1000, 3),
+    )
+
+
+def _init_worker(issuer_url: str, root_fingerprint: str, warmup_token: str) -> None:
+    configure_logging()
+    validator = new_validator(issuer_url, root_fingerprint)
+    validator.validate_token(warmup_token)
+    _WORKER["validator"] = validator
+
+
+def _validate_chunk(tokens: list[str]) -> list[float]:
+    return time_validations(_WORKER["validator"].validate_token, tokens)[1]
+
+
+def run_scheme(issuer: FakeIssuer, scheme: str, args: argparse.Namespace) -> None:
+    tokens = issuer.mint(scheme, args.tokens + 1)
+    warmup, tokens = tokens[0], tokens[1:]
+
+    # Cold: a new validator per token fetches the issuer documents and, for
+    # PKI, verifies the certificate chain
+    elapsed, latencies = time_validations(
+        lambda token: new_validator(issuer.url, issuer.root_fingerprint).validate_token(
+            token
+        ),
+        tokens[: args.cold],
+    )
+    report(f"{scheme} cold", elapsed, latencies)
+
+    # Warm: keys and chains are cached, every token is new
+    validator = new_validator(issuer.url, issuer.root_fingerprint)
+    validator.validate_token(warmup)
+    elapsed, latencies = time_validations(validator.validate_token, tokens)
+    report(f"{scheme} warm", elapsed, latencies)
+
+    # Repeated: the same tokens again, served from the claims cache
+    elapsed, latencies = time_validations(validator.validate_token, tokens)
+    report(f"{scheme} repeated", elapsed, latencies)
+
+    # Batch: the warm tokens through validate_tokens
+    batch_validator = new_validator(issuer.url, issuer.root_fingerprint)
+    batch_validator.validate_token(warmup)
+    start = time.perf_counter()
+    batch_validator.validate_tokens(tokens)
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "benchmark",
+        scenario=f"{scheme} batch",
+        validations=len(tokens),
+        per_sec=round(len(tokens) / elapsed),
+    )
+
+    # Process pool: warm validators in `workers` processes
+    chunks = [tokens[i :: args.workers] for i in range(args.workers)]
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(issuer.url, issuer.root_fingerprint, warmup),
+    ) as pool:
+        # Start the workers before timing
+        list(pool.map(_validate_chunk, [[warmup]] * args.workers))
+        start = time.perf_counter()
+        results = list(pool.map(_validate_chunk, chunks))
+        elapsed = time.perf_counter() - start
+    report(
+        f"{scheme} pool x{args.workers}",
+        elapsed,
+        [latency for chunk in results for latency in chunk],
+    )
+
+
+if __name__ == "__main__":
+    configure_logging()
+    args = parse_arguments()
+    issuer = FakeIssuer()
+    issuer.start()
+    try:
+        for scheme in ("oidc", "pki"):
+            run_scheme(issuer, scheme, args)
+    finally:
+        issuer.stop()
+    logger.info("issuer requests", requests=issuer.requests)
@@ -0,0 +1,35 @@
+import asyncio
+
+from flare_ai_consensus.consensus.batch import FairScheduler
+
+
+async def _hold(
+    scheduler: FairScheduler, model_id: str, prompt: str, release: asyncio.Event
+) -> None:
+    async with scheduler.slot(model_id, prompt):
+        await release.wait()
+
+
+def test_waiter_cancelled_while_slot_is_released() -> None:
+    async def scenario() -> None:
+        scheduler = FairScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, "a", "p1", release))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_hold(scheduler, "a", "p2", asyncio.Event()))
+        queued = asyncio.create_task(_hold(scheduler, "a", "p3", release))
+        await asyncio.sleep(0)
+        assert scheduler.running == 1
+
+        # The holder releases its slot before the cancelled waiter's task runs
+        release.set()
+        cancelled.cancel()
+        await asyncio.wait_for(asyncio.gather(holder, queued), timeout=1)
+        await asyncio.gather(cancelled, return_exceptions=True)
+
+        assert cancelled.cancelled()
+        assert scheduler.running == 0
+        assert scheduler.running_for("a") == 0
+        assert scheduler.waiting == 0
+
+    asyncio.run(scenario())
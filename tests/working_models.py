@@ -4,8 +4,10 @@ import structlog
 
 from flare_ai_consensus.router import (
     AsyncOpenRouterProvider,
+    AsyncRateLimiter,
     ChatRequest,
     CompletionRequest,
+    RateLimit,
 )
 from flare_ai_consensus.settings import ModelConfig, settings
 from flare_ai_consensus.utils import load_json, save_json
@@ -18,7 +20,6 @@ async def _test_model_completion(
     model: ModelConfig,
     test_prompt: str,
     api_endpoint: str,
-    delay: float = 1.0,
 ) -> tuple[ModelConfig, bool]:
     """
     Asynchronously sends a test request for a model using the specified API endpoint.
@@ -33,9 +34,6 @@ async def _test_model_completion(
     if not model_id:
         return (model, False)
 
-    # Introduce a delay
-    await asyncio.sleep(delay)
-
     # Handle completion endpoint
     if api_endpoint.lower() == "completion":
         completion_payload: CompletionRequest = {
@@ -92,8 +90,8 @@ async def filter_working_models(
     :return: A list of models (dicts) that work with the specified API.
     """
     tasks = [
-        _test_model_completion(provider, model, test_prompt, api_endpoint, delay=i * 3)
-        for i, model in enumerate(free_models)
+        _test_model_completion(provider, model, test_prompt, api_endpoint)
+        for model in free_models
     ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -114,9 +112,12 @@ async def main() -> None:
     free_models = load_json(free_models_file).get("data", [])
     test_prompt = "Who is Ash Ketchum?"
 
-    # Initialize the asynchronous OpenRouter provider.
+    # Initialize the asynchronous OpenRouter provider, sending at most one
+    # request every 3 seconds to stay within the free-tier rate limit.
     provider = AsyncOpenRouterProvider(
-        api_key=settings.open_router_api_key, base_url=settings.open_router_base_url
+        api_key=settings.open_router_api_key,
+        base_url=settings.open_router_base_url,
+        rate_limiter=AsyncRateLimiter(per_key=RateLimit(requests_per_second=1 / 3)),
     )
 
     # Filter free models that work with the completions endpoints.